@@ -16,31 +16,15 @@ function Dashboard({ user, token }) {
 
   const fetchDashboardData = async () => {
     try {
-      // Fetch health summary
-      const summaryResponse = await fetch('http://localhost:5000/api/health/summary', {
+      // Summary, active goals and recent records in one request
+      const response = await fetch('http://localhost:5000/api/dashboard?goals_limit=3&records_limit=5', {
         headers: { 'Authorization': `Bearer ${token}` }
       })
-      if (summaryResponse.ok) {
-        const summaryData = await summaryResponse.json()
-        setHealthSummary(summaryData)
-      }
-
-      // Fetch active goals
-      const goalsResponse = await fetch('http://localhost:5000/api/goals?status=active', {
-        headers: { 'Authorization': `Bearer ${token}` }
-      })
-      if (goalsResponse.ok) {
-        const goalsData = await goalsResponse.json()
-        setGoals(goalsData.slice(0, 3)) // Show only first 3 goals
-      }
-
-      // Fetch recent health records
-      const recordsResponse = await fetch('http://localhost:5000/api/health/records?limit=5', {
-        headers: { 'Authorization': `Bearer ${token}` }
-      })
-      if (recordsResponse.ok) {
-        const recordsData = await recordsResponse.json()
-        setRecentRecords(recordsData)
+      if (response.ok) {
+        const data = await response.json()
+        if (data.summary) setHealthSummary(data.summary)
+        if (data.goals) setGoals(data.goals)
+        if (data.recent_records) setRecentRecords(data.recent_records)
       }
     } catch (error) {
       console.error('Failed to fetch dashboard data:', error)
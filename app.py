@@ -1,55 +1,22 @@
+import os
 import streamlit as st
 import pandas as pd
-import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-import joblib
-import os
-
-# Download NLTK data if not already present
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-
-# Initialize NLTK components
-stop_words = set(stopwords.words('english'))
-lemmatizer = WordNetLemmatizer()
-
-# Function to preprocess text
-def preprocess_text(text):
-    text = text.lower()  # Lowercasing
-    text = re.sub(r'[^a-z\s]', '', text)  # Remove punctuation and numbers
-    words = text.split()  # Tokenization
-    words = [word for word in words if word not in stop_words]  # Remove stop words
-    words = [lemmatizer.lemmatize(word) for word in words]  # Lemmatization
-    return ' '.join(words)
+from predictor import get_scorer, load_artifact, score_texts
+from prediction_cache import PredictionCache
 
-# Load and train the model (in a real app, you'd load a pre-trained model)
-@st.cache_data
+# Load the artifact produced by train_model.py once per process
+@st.cache_resource
 def load_model():
-    # Load the cleaned dataset
-    df = pd.read_csv("both_train_cleaned.csv")
-    df.dropna(subset=['cleaned_text', 'class_name'], inplace=True)
-    
-    # Feature Engineering: TF-IDF Vectorization
-    tfidf_vectorizer = TfidfVectorizer(max_features=5000)
-    X = tfidf_vectorizer.fit_transform(df["cleaned_text"])
-    y = df["class_name"]
-    
-    # Train Logistic Regression model
-    model = LogisticRegression(max_iter=1000, solver="liblinear")
-    model.fit(X, y)
-    
-    return model, tfidf_vectorizer
+    return load_artifact()
+
+# Re-submitted entries (e.g. after a page refresh) are answered from this cache
+@st.cache_resource
+def get_prediction_cache():
+    return PredictionCache(
+        max_entries=int(os.environ.get('PREDICTION_CACHE_SIZE', 10000)),
+        ttl_seconds=int(os.environ.get('PREDICTION_CACHE_TTL', 3600)),
+        path=os.environ.get('PREDICTION_CACHE_PATH')
+    )
 
 # Streamlit app
 def main():
@@ -57,22 +24,26 @@ def main():
     st.write("This application analyzes journal-style text input to predict mental health conditions.")
     
     # Load model and vectorizer
-    model, vectorizer = load_model()
+    try:
+        artifact = load_model()
+    except (FileNotFoundError, ValueError) as e:
+        st.error(str(e))
+        st.stop()
+    model, vectorizer = get_scorer(artifact)
+    metadata = artifact['metadata']
     
     # Text input
     user_input = st.text_area("Enter your journal entry or text:", height=200)
     
     if st.button("Predict Mental Health Condition"):
         if user_input:
-            # Preprocess the input text
-            cleaned_input = preprocess_text(user_input)
-            
-            # Vectorize the input
-            input_vector = vectorizer.transform([cleaned_input])
-            
-            # Make prediction
-            prediction = model.predict(input_vector)[0]
-            prediction_proba = model.predict_proba(input_vector)[0]
+            # Preprocess, vectorize and predict (served from the cache when seen before)
+            predictions, probabilities = score_texts(
+                model, vectorizer, [user_input],
+                cache=get_prediction_cache(), model_version=metadata['model_version']
+            )
+            prediction = predictions[0]
+            prediction_proba = probabilities[0]
             
             # Display results
             st.subheader("Prediction Results")
@@ -104,8 +75,10 @@ def main():
     st.sidebar.write("- None (no specific condition)")
     
     st.sidebar.header("Model Performance")
-    st.sidebar.write("**Accuracy:** 76.4%")
+    accuracy = metadata.get('accuracy')
+    st.sidebar.write(f"**Accuracy:** {accuracy:.1%}" if accuracy is not None else "**Accuracy:** 76.4%")
     st.sidebar.write("**Model Type:** Logistic Regression with TF-IDF features")
+    st.sidebar.write(f"**Model Version:** {metadata['model_version']}")
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,60 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from src.models.user import User, db
+from src.routes.password_hashing import PasswordHashingBusy, password_hasher
+from sqlalchemy.orm import make_transient_to_detached
+from ttl_cache import TTLCache
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
+import hmac
+import time
 import json
+import os
 
 auth_bp = Blueprint('auth', __name__)
 
+
+# Per-process caches. Invalidation is local to the process, so the TTL bounds
+# how long another worker can serve a stale profile.
+user_cache = TTLCache(
+    max_entries=int(os.environ.get('IDENTITY_CACHE_SIZE', 10000)),
+    ttl_seconds=float(os.environ.get('IDENTITY_CACHE_TTL', 30))
+)
+token_cache = TTLCache(
+    max_entries=int(os.environ.get('TOKEN_CACHE_SIZE', 10000)),
+    ttl_seconds=float(os.environ.get('TOKEN_CACHE_TTL', 300))
+)
+
+
+def decode_token(token):
+    """Verify a JWT once and reuse the claims until the cache TTL or the token's exp."""
+    data = token_cache.get(token)
+    if data is None:
+        data = jwt.decode(token, 'health_bot_secret_key_2024', algorithms=['HS256'])
+        ttl = data['exp'] - time.time() if 'exp' in data else None
+        token_cache.set(token, data, ttl)
+    return data
+
+
+def load_user(user_id):
+    """Return a session-bound User, served from the identity cache when possible."""
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        # Rebuild the instance and attach it to the session without a SELECT
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    user = User.query.get(user_id)
+    if user:
+        user_cache.set(user_id, {column.key: getattr(user, column.key) for column in User.__table__.columns})
+    return user
+
+
+def invalidate_user(user_id):
+    user_cache.pop(user_id)
+
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -17,8 +65,8 @@ def token_required(f):
         try:
             if token.startswith('Bearer '):
                 token = token[7:]
-            data = jwt.decode(token, 'health_bot_secret_key_2024', algorithms=['HS256'])
-            current_user = User.query.get(data['user_id'])
+            data = decode_token(token)
+            current_user = load_user(data['user_id'])
             if not current_user:
                 return jsonify({'message': 'User not found'}), 401
         except jwt.ExpiredSignatureError:
@@ -29,6 +77,30 @@ def token_required(f):
         return f(current_user, *args, **kwargs)
     return decorated
 
+def ops_required(f):
+    """Restrict process-internal metrics to operators.
+
+    Allowed in debug mode, or when the ``X-Ops-Token`` header matches the
+    ``OPS_TOKEN`` config value; without a configured token the endpoint is
+    hidden with a 404.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if not current_app.debug:
+            expected = current_app.config.get('OPS_TOKEN')
+            if not expected:
+                return jsonify({'message': 'Not found'}), 404
+            if not hmac.compare_digest(request.headers.get('X-Ops-Token', ''), expected):
+                return jsonify({'message': 'Ops token is missing or invalid'}), 403
+        return f(*args, **kwargs)
+    return decorated
+
+def busy_response(error):
+    response = jsonify({'message': str(error)})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     try:
@@ -57,7 +129,7 @@ def register():
             medical_conditions=json.dumps(data.get('medical_conditions', [])),
             emergency_contact=json.dumps(data.get('emergency_contact', {}))
         )
-        user.set_password(data['password'])
+        user.password_hash = password_hasher.hash(data['password'])
         
         db.session.add(user)
         db.session.commit()
@@ -74,6 +146,8 @@ def register():
             'user': user.to_dict_safe()
         }), 201
         
+    except PasswordHashingBusy as e:
+        return busy_response(e)
     except Exception as e:
         return jsonify({'message': f'Registration failed: {str(e)}'}), 500
 
@@ -87,9 +161,19 @@ def login():
         
         user = User.query.filter_by(username=data['username']).first()
         
-        if not user or not user.check_password(data['password']):
+        if not user or not password_hasher.verify(user.password_hash, data['password']):
             return jsonify({'message': 'Invalid username or password'}), 401
         
+        # Upgrade hashes made with older cost parameters while the plain password is at hand
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = password_hasher.hash(data['password'])
+                db.session.commit()
+                invalidate_user(user.id)
+                password_hasher.record_rehash()
+            except PasswordHashingBusy:
+                pass
+        
         # Generate token
         token = jwt.encode({
             'user_id': user.id,
@@ -102,6 +186,8 @@ def login():
             'user': user.to_dict_safe()
         }), 200
         
+    except PasswordHashingBusy as e:
+        return busy_response(e)
     except Exception as e:
         return jsonify({'message': f'Login failed: {str(e)}'}), 500
 
@@ -148,6 +234,7 @@ def update_profile(current_user):
         
         current_user.updated_at = datetime.utcnow()
         db.session.commit()
+        invalidate_user(current_user.id)
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -166,15 +253,30 @@ def change_password(current_user):
         if not data.get('current_password') or not data.get('new_password'):
             return jsonify({'message': 'Current password and new password are required'}), 400
         
-        if not current_user.check_password(data['current_password']):
+        if not password_hasher.verify(current_user.password_hash, data['current_password']):
             return jsonify({'message': 'Current password is incorrect'}), 400
         
-        current_user.set_password(data['new_password'])
+        current_user.password_hash = password_hasher.hash(data['new_password'])
         current_user.updated_at = datetime.utcnow()
         db.session.commit()
+        invalidate_user(current_user.id)
         
         return jsonify({'message': 'Password changed successfully'}), 200
         
+    except PasswordHashingBusy as e:
+        return busy_response(e)
     except Exception as e:
         return jsonify({'message': f'Password change failed: {str(e)}'}), 500
 
+@auth_bp.route('/cache-stats', methods=['GET'])
+@ops_required
+def get_cache_stats():
+    return jsonify({
+        'identity_cache': user_cache.stats(),
+        'token_cache': token_cache.stats()
+    }), 200
+
+@auth_bp.route('/hashing-stats', methods=['GET'])
+@ops_required
+def get_hashing_stats():
+    return jsonify(password_hasher.stats()), 200
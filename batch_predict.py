@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from predictor import DEFAULT_ARTIFACT_PATH, get_scorer, load_artifact, score_texts
+
+# Artifact and scorer loaded once per process (the main process or each pool worker)
+_artifact = None
+_model = _vectorizer = None
+
+
+def _init_worker(artifact_path, engine=None):
+    global _artifact, _model, _vectorizer
+    _artifact = load_artifact(artifact_path)
+    _model, _vectorizer = get_scorer(_artifact, engine)
+
+
+def score_chunk(texts):
+    predictions, probabilities = score_texts(_model, _vectorizer, texts)
+    return list(predictions), probabilities
+
+
+def read_chunks(path, input_format, text_column, id_column, chunksize):
+    """Yield (ids, texts) pairs without loading the whole input into memory."""
+    columns = [text_column] + ([id_column] if id_column else [])
+    if input_format == 'csv':
+        reader = pd.read_csv(path, usecols=columns, chunksize=chunksize)
+    else:
+        reader = pd.read_json(path, lines=True, chunksize=chunksize)
+
+    for chunk in reader:
+        texts = chunk[text_column].fillna('').astype(str).tolist()
+        ids = chunk[id_column].tolist() if id_column else None
+        yield ids, texts
+
+
+class PredictionWriter:
+    """Append predictions chunk by chunk to a CSV or JSONL file."""
+
+    def __init__(self, path, output_format, classes, id_column):
+        self.output_format = output_format
+        self.classes = [str(c) for c in classes]
+        self.id_column = id_column
+        self.wrote_header = False
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+
+    def write(self, ids, predictions, probabilities):
+        frame = pd.DataFrame(probabilities, columns=[f'proba_{c}' for c in self.classes])
+        frame.insert(0, 'prediction', predictions)
+        if self.id_column:
+            frame.insert(0, self.id_column, ids)
+
+        if self.output_format == 'csv':
+            frame.to_csv(self.file, header=not self.wrote_header, index=False)
+            self.wrote_header = True
+        else:
+            for row in frame.to_dict(orient='records'):
+                self.file.write(json.dumps(row, default=str) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def _detect_format(path, explicit):
+    if explicit:
+        return explicit
+    return 'jsonl' if os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson', '.json') else 'csv'
+
+
+def run(input_path, output_path, artifact_path=DEFAULT_ARTIFACT_PATH, text_column='text',
+        id_column=None, chunksize=10000, workers=0, input_format=None, output_format=None,
+        engine=None, log=sys.stderr):
+    input_format = _detect_format(input_path, input_format)
+    output_format = _detect_format(output_path, output_format)
+
+    _init_worker(artifact_path, engine)
+    writer = PredictionWriter(output_path, output_format, _model.classes_, id_column)
+    chunks = read_chunks(input_path, input_format, text_column, id_column, chunksize)
+
+    rows = 0
+    started = time.perf_counter()
+
+    def report(ids, result):
+        nonlocal rows
+        predictions, probabilities = result
+        writer.write(ids, predictions, probabilities)
+        rows += len(predictions)
+        elapsed = time.perf_counter() - started
+        print(f"{rows} rows scored, {rows / elapsed:.0f} rows/sec", file=log)
+
+    try:
+        if workers and workers > 1:
+            # Keep at most two chunks per worker in flight so memory stays bounded
+            # and results are written in input order.
+            in_flight = deque()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(artifact_path, engine)) as pool:
+                for ids, texts in chunks:
+                    in_flight.append((ids, pool.submit(score_chunk, texts)))
+                    if len(in_flight) >= workers * 2:
+                        ids, future = in_flight.popleft()
+                        report(ids, future.result())
+                while in_flight:
+                    ids, future = in_flight.popleft()
+                    report(ids, future.result())
+        else:
+            for ids, texts in chunks:
+                report(ids, score_chunk(texts))
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'rows': rows,
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round(rows / elapsed, 1) if elapsed > 0 else None,
+        'workers': workers or 1,
+        'chunksize': chunksize,
+        'engine': type(_model).__name__,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a large CSV/JSONL corpus of journal entries in chunks.")
+    parser.add_argument("input", help="Input CSV or JSONL file")
+    parser.add_argument("output", help="Output CSV or JSONL file")
+    parser.add_argument("--artifact", default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--id-column", default=None, help="Column copied through to the output")
+    parser.add_argument("--chunksize", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 scores in-process)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], default=None)
+    parser.add_argument("--engine", choices=["auto", "numpy", "sklearn"], default=None,
+                        help="Scoring engine (default: PREDICTOR_ENGINE or auto)")
+    args = parser.parse_args()
+
+    summary = run(args.input, args.output, args.artifact, args.text_column, args.id_column,
+                  args.chunksize, args.workers, args.input_format, args.output_format, args.engine)
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
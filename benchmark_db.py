@@ -0,0 +1,124 @@
+import os
+import sys
+# Same import root as main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import json
+import multiprocessing
+import tempfile
+import time
+
+import numpy as np
+
+# SQLite settings compared by default: the old defaults vs. WAL tuning
+SQLITE_PROFILES = {
+    'rollback_journal': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL'},
+    'wal': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL'},
+}
+
+
+def _load_app(env):
+    os.environ.update(env)
+    os.environ['NOTIFICATION_DISPATCHER'] = '0'
+    # Pool workers are daemonic and cannot start the hashing process pool
+    os.environ['PASSWORD_HASH_WORKERS'] = '0'
+    from src.main import app
+    return app
+
+
+def _setup(env):
+    """Create the schema once before the workers start (they would race on create_all)."""
+    _load_app(env)
+
+
+def _worker(task):
+    """One API worker process: register a user, then POST health records as fast as possible."""
+    env, worker_id, requests = task
+    client = _load_app(env).test_client()
+
+    username = f'bench_{os.getpid()}_{worker_id}'
+    response = client.post('/api/auth/register', json={
+        'username': username, 'email': f'{username}@example.com', 'password': 'benchmark'
+    })
+    headers = {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+    latencies, errors = [], 0
+    started = time.time()
+    for i in range(requests):
+        t0 = time.perf_counter()
+        response = client.post('/api/health/records', headers=headers, json={
+            'record_type': 'heart_rate', 'value': {'bpm': 60 + i % 40}
+        })
+        latencies.append(time.perf_counter() - t0)
+        if response.status_code != 201:
+            errors += 1
+    return started, time.time(), latencies, errors
+
+
+def run_level(env, workers, requests_per_worker):
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers) as pool:
+        results = pool.map(_worker, [(env, i, requests_per_worker) for i in range(workers)])
+
+    started = min(result[0] for result in results)
+    finished = max(result[1] for result in results)
+    latencies = np.concatenate([result[2] for result in results])
+    errors = sum(result[3] for result in results)
+    total = workers * requests_per_worker
+    return {
+        'workers': workers,
+        'requests': total,
+        'errors': errors,
+        'error_rate': round(errors / total, 4),
+        'writes_per_sec': round((total - errors) / (finished - started), 1),
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 2),
+        'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 2),
+        'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 2),
+    }
+
+
+def run(profiles, worker_levels, requests_per_worker, database_url=None):
+    report = {'requests_per_worker': requests_per_worker, 'results': {}}
+    for name, settings in profiles.items():
+        report['results'][name] = []
+        for workers in worker_levels:
+            with tempfile.TemporaryDirectory() as tmp:
+                env = dict(settings)
+                env['DATABASE_URL'] = database_url or f"sqlite:///{os.path.join(tmp, 'benchmark.db')}"
+                context = multiprocessing.get_context('spawn')
+                process = context.Process(target=_setup, args=(env,))
+                process.start()
+                process.join()
+
+                result = run_level(env, workers, requests_per_worker)
+                report['results'][name].append(result)
+                print(f"{name}: {workers} workers -> {result['writes_per_sec']} writes/sec, "
+                      f"p95 {result['p95_ms']}ms, {result['errors']} errors", file=sys.stderr)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure health record write throughput with several API worker processes.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker process counts to test")
+    parser.add_argument("--requests", type=int, default=200, help="Record POSTs per worker")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(SQLITE_PROFILES), default=sorted(SQLITE_PROFILES),
+                        help="SQLite settings to compare")
+    parser.add_argument("--database-url", default=None,
+                        help="Benchmark an existing database (e.g. MySQL) instead of temporary SQLite files")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    profiles = {'database_url': {}} if args.database_url else {name: SQLITE_PROFILES[name] for name in args.profiles}
+    report = run(profiles, args.workers, args.requests, args.database_url)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from predictor import DEFAULT_ARTIFACT_PATH, get_preprocessor, get_scorer, load_artifact, preprocess_text
+
+# Used when the artifact has no vocabulary to draw from (e.g. hashing models)
+FALLBACK_WORDS = (
+    "feel anxious tired sleep work friend family panic worry sad happy focus task "
+    "forget remember mood energy night day week therapy medication doctor stress "
+    "thought mind heart racing crying alone memory flashback attention restless"
+).split()
+
+
+def synthetic_texts(vectorizer, lengths, per_length, seed):
+    """Journal-like texts built from the model vocabulary plus punctuation and stop words."""
+    rng = random.Random(seed)
+    vocabulary = getattr(vectorizer, 'vocabulary_', None) or getattr(vectorizer, 'vocabulary', None)
+    words = sorted(vocabulary) if vocabulary else FALLBACK_WORDS
+    filler = ["I", "the", "and", "was", "really", "today", "it's", "my"]
+    texts = {}
+    for length in lengths:
+        texts[length] = [
+            ' '.join(rng.choice(words) if rng.random() < 0.6 else rng.choice(filler) for _ in range(length)) + '.'
+            for _ in range(per_length)
+        ]
+    return texts
+
+
+def summarize(samples, items_per_sample=1):
+    """Latency percentiles (ms) and throughput (items/sec) for a list of durations in seconds."""
+    durations = np.asarray(samples)
+    total = durations.sum()
+    return {
+        'n': len(durations),
+        'p50_ms': round(float(np.percentile(durations, 50)) * 1000, 4),
+        'p95_ms': round(float(np.percentile(durations, 95)) * 1000, 4),
+        'p99_ms': round(float(np.percentile(durations, 99)) * 1000, 4),
+        'mean_ms': round(float(durations.mean()) * 1000, 4),
+        'throughput_per_sec': round(len(durations) * items_per_sample / total, 1) if total > 0 else None,
+    }
+
+
+def bench_single(model, vectorizer, texts, repeat):
+    """Time each stage for one document at a time, as the Streamlit button handler does."""
+    stages = {'preprocess_text': [], 'transform': [], 'predict': [], 'predict_proba': [], 'end_to_end': []}
+    for _ in range(repeat):
+        for text in texts:
+            t0 = time.perf_counter()
+            cleaned = preprocess_text(text)
+            t1 = time.perf_counter()
+            vector = vectorizer.transform([cleaned])
+            t2 = time.perf_counter()
+            model.predict(vector)
+            t3 = time.perf_counter()
+            model.predict_proba(vector)
+            t4 = time.perf_counter()
+
+            stages['preprocess_text'].append(t1 - t0)
+            stages['transform'].append(t2 - t1)
+            stages['predict'].append(t3 - t2)
+            stages['predict_proba'].append(t4 - t3)
+            stages['end_to_end'].append(t4 - t0)
+    return {stage: summarize(samples) for stage, samples in stages.items()}
+
+
+def bench_batched(model, vectorizer, texts, batch_size, repeat):
+    """Time each stage per batch; throughput is reported in documents/sec."""
+    stages = {'preprocess_text': [], 'transform': [], 'predict': [], 'predict_proba': [], 'end_to_end': []}
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts) - batch_size + 1, batch_size)] or [texts]
+    for _ in range(repeat):
+        for batch in batches:
+            t0 = time.perf_counter()
+            cleaned = get_preprocessor().batch(batch)
+            t1 = time.perf_counter()
+            matrix = vectorizer.transform(cleaned)
+            t2 = time.perf_counter()
+            model.predict(matrix)
+            t3 = time.perf_counter()
+            model.predict_proba(matrix)
+            t4 = time.perf_counter()
+
+            stages['preprocess_text'].append(t1 - t0)
+            stages['transform'].append(t2 - t1)
+            stages['predict'].append(t3 - t2)
+            stages['predict_proba'].append(t4 - t3)
+            stages['end_to_end'].append(t4 - t0)
+    return {stage: summarize(samples, len(batches[0])) for stage, samples in stages.items()}
+
+
+def run(artifact_path=DEFAULT_ARTIFACT_PATH, lengths=(10, 50, 200, 1000), per_length=200,
+        batch_sizes=(32, 256), repeat=3, sample_file=None, text_column='text', seed=0, engine='sklearn'):
+    artifact = load_artifact(artifact_path)
+    model, vectorizer = get_scorer(artifact, engine)
+
+    corpora = {f'synthetic_{length}_words': texts
+               for length, texts in synthetic_texts(vectorizer, lengths, per_length, seed).items()}
+    if sample_file:
+        sample = pd.read_csv(sample_file, usecols=[text_column])[text_column].dropna().astype(str)
+        corpora['sample'] = sample.head(per_length * len(lengths)).tolist()
+
+    # Warm up imports, lazy caches and BLAS before measuring
+    bench_single(model, vectorizer, next(iter(corpora.values()))[:20], 1)
+
+    results = {}
+    for name, texts in corpora.items():
+        results[name] = {'single': bench_single(model, vectorizer, texts, repeat)}
+        for batch_size in batch_sizes:
+            results[name][f'batch_{batch_size}'] = bench_batched(model, vectorizer, texts, batch_size, repeat)
+
+    return {
+        'created_at': datetime.utcnow().isoformat(),
+        'model_version': artifact['metadata']['model_version'],
+        'engine': type(model).__name__,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sklearn': sklearn.__version__,
+            'numpy': np.__version__,
+        },
+        'config': {'lengths': list(lengths), 'per_length': per_length,
+                   'batch_sizes': list(batch_sizes), 'repeat': repeat},
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Return a list of human-readable p95 regressions beyond ``threshold`` (0.2 = 20%)."""
+    regressions = []
+    for corpus, modes in current['results'].items():
+        for mode, stages in modes.items():
+            for stage, stats in stages.items():
+                try:
+                    before = baseline['results'][corpus][mode][stage]['p95_ms']
+                except KeyError:
+                    continue
+                if before and stats['p95_ms'] > before * (1 + threshold):
+                    regressions.append(f"{corpus}/{mode}/{stage}: p95 {before}ms -> {stats['p95_ms']}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the mental health predictor hot path.")
+    parser.add_argument("--artifact", default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 50, 200, 1000],
+                        help="Synthetic document lengths in words")
+    parser.add_argument("--per-length", type=int, default=200, help="Documents per length")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 256])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sample-file", default=None, help="CSV with real journal texts")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--output", default=None, help="Write JSON results to this file")
+    parser.add_argument("--baseline", default=None, help="Previous JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed p95 slowdown vs baseline")
+    parser.add_argument("--engine", choices=["sklearn", "numpy"], default="sklearn")
+    args = parser.parse_args()
+
+    report = run(args.artifact, args.lengths, args.per_length, args.batch_sizes, args.repeat,
+                 args.sample_file, args.text_column, engine=args.engine)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+from flask import Blueprint, jsonify, request, current_app
+from src.models.user import Goal, HealthRecord
+from src.routes.auth import load_user, token_required
+from src.routes.health import build_health_summary
+from src.routes.pagination import paginate
+from src.routes.serialization import etag_by_data_version
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+
+def summary_section(user_id, options):
+    # Loaded in the worker's own session (served from the identity cache when warm)
+    return build_health_summary(load_user(user_id))
+
+
+def goals_section(user_id, options):
+    query = Goal.query.filter_by(user_id=user_id, status='active')
+    goals, _ = paginate(query, Goal.created_at, Goal.id, limit=options['goals_limit'])
+    return [goal.to_dict() for goal in goals]
+
+
+def recent_records_section(user_id, options):
+    query = HealthRecord.query.filter_by(user_id=user_id)
+    records, _ = paginate(query, HealthRecord.recorded_at, HealthRecord.id, limit=options['records_limit'])
+    return [record.to_dict() for record in records]
+
+
+SECTIONS = {
+    'summary': summary_section,
+    'goals': goals_section,
+    'recent_records': recent_records_section,
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Thread pool shared by all dashboard requests (``DASHBOARD_WORKERS``, default 4)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config.get('DASHBOARD_WORKERS', 4),
+                    thread_name_prefix='dashboard'
+                )
+    return _executor
+
+
+def run_section(app, name, user_id, options):
+    """Run one section in its own app context, and therefore its own database session."""
+    started = time.perf_counter()
+    try:
+        with app.app_context():
+            return name, SECTIONS[name](user_id, options), None, time.perf_counter() - started
+    except Exception as e:
+        return name, None, str(e), time.perf_counter() - started
+
+
+@dashboard_bp.route('', methods=['GET'])
+@token_required
+@etag_by_data_version()
+def get_dashboard(current_user):
+    try:
+        requested = request.args.get('sections')
+        names = [name.strip() for name in requested.split(',') if name.strip()] if requested else list(SECTIONS)
+        if not names or any(name not in SECTIONS for name in names):
+            return jsonify({'message': f'Invalid sections. Choose from: {", ".join(SECTIONS)}'}), 400
+        
+        options = {
+            'goals_limit': request.args.get('goals_limit', 3, type=int),
+            'records_limit': request.args.get('records_limit', 5, type=int)
+        }
+        
+        started = time.perf_counter()
+        app = current_app._get_current_object()
+        futures = [get_executor().submit(run_section, app, name, current_user.id, options) for name in names]
+        
+        dashboard = {'timings_ms': {}}
+        errors = {}
+        for future in futures:
+            name, result, error, elapsed = future.result()
+            dashboard['timings_ms'][name] = round(elapsed * 1000, 2)
+            if error:
+                errors[name] = error
+            else:
+                dashboard[name] = result
+        dashboard['timings_ms']['total'] = round((time.perf_counter() - started) * 1000, 2)
+        
+        if errors:
+            # Partial result: report the failures and keep clients from caching it
+            dashboard['errors'] = errors
+            response = jsonify(dashboard)
+            response.headers['Cache-Control'] = 'no-store'
+            return response, 200
+        
+        return jsonify(dashboard), 200
+
+    except Exception as e:
+        return jsonify({'message': f'Failed to build dashboard: {str(e)}'}), 500
@@ -0,0 +1,69 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+import os
+
+DEFAULT_DATABASE_URL = 'sqlite:///health_bot.db'
+
+
+def _env_flag(name, default):
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes', 'on')
+
+
+def database_url_from_env():
+    """``DATABASE_URL`` with bare MySQL URLs pointed at the PyMySQL driver."""
+    url = os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
+    if url.startswith('mysql://'):
+        url = 'mysql+pymysql://' + url[len('mysql://'):]
+    return url
+
+
+def engine_options_from_env(url):
+    """SQLALCHEMY_ENGINE_OPTIONS for ``url``: connection pool settings, or SQLite connect arguments."""
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite':
+        options = {'connect_args': {'timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)) / 1000}}
+        if url.database not in (None, '', ':memory:'):
+            # File databases use a QueuePool; the in-memory ones need their default single-connection pool
+            options['pool_size'] = int(os.environ.get('DB_POOL_SIZE', 10))
+            options['max_overflow'] = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+        return options
+
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': _env_flag('DB_POOL_PRE_PING', '1'),
+    }
+
+
+def sqlite_pragmas_from_env():
+    return {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'foreign_keys': os.environ.get('SQLITE_FOREIGN_KEYS', 'ON'),
+    }
+
+
+def configure_sqlite(engine, pragmas=None):
+    """Apply PRAGMAs to every new SQLite connection of ``engine``; no-op for other databases.
+
+    WAL lets readers proceed while a writer commits, and ``synchronous=NORMAL``
+    only syncs at checkpoints instead of on every commit, which is safe in
+    WAL mode. ``busy_timeout`` makes concurrent writers wait for the lock
+    instead of failing with "database is locked". ``foreign_keys`` enforces
+    foreign keys, including ``ON DELETE CASCADE``, which SQLite otherwise
+    ignores.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = pragmas or sqlite_pragmas_from_env()
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
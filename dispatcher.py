@@ -0,0 +1,255 @@
+from src.models.user import Notification, db
+from src.routes.serialization import bump_data_version
+from datetime import datetime, timedelta
+from collections import defaultdict
+from sqlalchemy import select, update
+import heapq
+import os
+import queue
+import threading
+
+
+def claim_pending_notifications(now, *criteria):
+    """Mark the pending notifications matching ``criteria`` as sent; returns only the rows this call changed.
+
+    The UPDATE is guarded by ``status = 'pending'``, so when several processes
+    race for the same rows each one is claimed by exactly one of them. The
+    claimed ids come back through RETURNING where the database supports it;
+    elsewhere (MySQL) the rows are locked with SELECT ... FOR UPDATE first.
+    """
+    guard = (Notification.status == 'pending', *criteria)
+    if db.session.get_bind().dialect.update_returning:
+        ids = db.session.execute(
+            update(Notification).where(*guard).values(status='sent', sent_at=now)
+            .returning(Notification.id).execution_options(synchronize_session=False)
+        ).scalars().all()
+    else:
+        ids = db.session.execute(
+            select(Notification.id).where(*guard).with_for_update(skip_locked=True)
+        ).scalars().all()
+        if ids:
+            Notification.query.filter(Notification.id.in_(ids)).update(
+                {'status': 'sent', 'sent_at': now}, synchronize_session=False)
+    if not ids:
+        return []
+
+    notifications = Notification.query.filter(Notification.id.in_(ids)).order_by(
+        Notification.scheduled_for.asc(), Notification.id.asc()
+    ).populate_existing().all()
+    bump_data_version(notification.user_id for notification in notifications)
+    return notifications
+
+
+class NotificationDispatcher:
+    """Background worker that moves notifications from pending to sent when they are due.
+
+    Upcoming ``scheduled_for`` times are kept in a min-heap; the worker sleeps
+    until the earliest one is due (or a new one is scheduled earlier), marks
+    every due item sent with batched UPDATEs and pushes it to the clients
+    subscribed through the notification stream. The heap is refilled from the
+    database every ``refill_seconds``, which also expands due medication
+    schedules.
+
+    Only notifications of users with a stream open on this process are
+    claimed; everything else stays pending for ``/pending`` or for the
+    process the user's stream is connected to. Items are claimed with
+    ``claim_pending_notifications``, so running a dispatcher in several
+    processes (or alongside clients polling ``/pending``) never sends an
+    item twice.
+
+    The worker thread is started lazily and restarted by ``schedule`` and
+    ``subscribe`` when it has died or belongs to the process this one was
+    forked from (e.g. a ``gunicorn --preload`` master).
+    """
+
+    def __init__(self, refill_seconds=30, batch_size=500):
+        self.refill_seconds = refill_seconds
+        self.batch_size = batch_size
+        self.app = None
+        self._enabled = False
+        self._reset_state()
+        self.stats = {'dispatched': 0, 'batches': 0, 'pushed': 0, 'refills': 0, 'errors': 0, 'restarts': 0}
+
+    def _reset_state(self):
+        self._heap = []  # (scheduled_for, notification_id)
+        self._queued = set()
+        self._condition = threading.Condition()
+        self._subscribers = defaultdict(set)  # user_id -> set of queue.Queue
+        self._subscribers_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._next_refill = datetime.min
+        self._horizon = datetime.min  # the heap holds every subscribed item due up to here
+        self._refill_requests = 0  # bumped by subscribe() to ask for an immediate refill
+
+    def init_app(self, app):
+        self.app = app
+        self.refill_seconds = app.config.get('NOTIFICATION_REFILL_SECONDS', self.refill_seconds)
+        self.batch_size = app.config.get('NOTIFICATION_DISPATCH_BATCH_SIZE', self.batch_size)
+        self._enabled = True
+        self._ensure_started()
+
+    def _ensure_started(self):
+        """Start the worker thread if it is not running in this process; returns whether it runs."""
+        if not self._enabled:
+            return False
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return True
+        with self._start_lock:
+            if self._pid is not None and self._pid != os.getpid():
+                # Forked after starting (e.g. gunicorn --preload): the thread, its locks and
+                # the queued items stayed in the parent
+                self._reset_state()
+            if self._thread is None or not self._thread.is_alive():
+                if self._thread is not None:
+                    self.stats['restarts'] += 1
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+                self._thread.start()
+        return True
+
+    def schedule(self, notification):
+        """Queue a just-committed notification if it is due before the next refill."""
+        if notification.status != 'pending' or notification.scheduled_for is None:
+            return
+        if not self._ensure_started():
+            return
+        if notification.user_id not in self._subscribed_users():
+            return
+        with self._condition:
+            if notification.scheduled_for <= self._horizon and notification.id not in self._queued:
+                heapq.heappush(self._heap, (notification.scheduled_for, notification.id))
+                self._queued.add(notification.id)
+                self._condition.notify()
+
+    def subscribe(self, user_id):
+        self._ensure_started()
+        subscription = queue.Queue(maxsize=1000)
+        with self._subscribers_lock:
+            self._subscribers[user_id].add(subscription)
+        # Refill now so notifications already due for this user are pushed without waiting
+        with self._condition:
+            self._next_refill = datetime.min
+            self._refill_requests += 1
+            self._condition.notify()
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self._subscribers_lock:
+            self._subscribers[user_id].discard(subscription)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def _subscribed_users(self):
+        with self._subscribers_lock:
+            return list(self._subscribers)
+
+    def _set_next_refill(self, next_refill, requests_seen):
+        # A subscribe() during the refill asked for another one; keep its reset
+        with self._condition:
+            if self._refill_requests == requests_seen:
+                self._next_refill = next_refill
+
+    def _refill(self, now):
+        from src.routes.notifications import materialize_due_reminders
+
+        next_refill = now + timedelta(seconds=self.refill_seconds)
+        with self._condition:
+            requests_seen = self._refill_requests
+            # Items scheduled while the query runs are queued by schedule() instead
+            self._horizon = max(self._horizon, next_refill)
+        # Expand schedules up to the next refill so those reminders are pushed on time
+        if materialize_due_reminders(until=next_refill):
+            db.session.commit()
+
+        user_ids = self._subscribed_users()
+        upcoming = []
+        if user_ids:
+            upcoming = db.session.query(Notification.scheduled_for, Notification.id).filter(
+                Notification.status == 'pending',
+                Notification.user_id.in_(user_ids),
+                Notification.scheduled_for.isnot(None),
+                Notification.scheduled_for <= next_refill
+            ).all()
+        db.session.rollback()
+
+        with self._condition:
+            for scheduled_for, notification_id in upcoming:
+                if notification_id not in self._queued:
+                    heapq.heappush(self._heap, (scheduled_for, notification_id))
+                    self._queued.add(notification_id)
+        self._set_next_refill(next_refill, requests_seen)
+        self.stats['refills'] += 1
+
+    def _pop_due(self, now):
+        due = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                _, notification_id = heapq.heappop(self._heap)
+                self._queued.discard(notification_id)
+                due.append(notification_id)
+        return due
+
+    def _dispatch(self, notification_ids, now):
+        for start in range(0, len(notification_ids), self.batch_size):
+            chunk = notification_ids[start:start + self.batch_size]
+            # Users who disconnected since the item was queued keep it pending for /pending
+            user_ids = self._subscribed_users()
+            if not user_ids:
+                return
+            # Only push what this process claimed; rows sent elsewhere meanwhile are skipped
+            notifications = claim_pending_notifications(
+                now, Notification.id.in_(chunk), Notification.user_id.in_(user_ids))
+            payloads = [(notification.user_id, notification.to_dict()) for notification in notifications]
+            db.session.commit()
+            if not payloads:
+                continue
+
+            self.stats['batches'] += 1
+            self.stats['dispatched'] += len(payloads)
+            for user_id, payload in payloads:
+                self._push(user_id, payload)
+
+    def _push(self, user_id, payload):
+        with self._subscribers_lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.put_nowait(payload)
+                self.stats['pushed'] += 1
+            except queue.Full:
+                pass
+
+    def run_pending(self, now=None):
+        """Run one dispatch pass: refill the heap if it is time to, then send everything due by ``now``."""
+        now = now or datetime.utcnow()
+        with self.app.app_context():
+            if now >= self._next_refill:
+                self._refill(now)
+            due = self._pop_due(now)
+            if due:
+                self._dispatch(due, now)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                requests_seen = self._refill_requests
+            try:
+                self.run_pending()
+            except Exception:
+                self.stats['errors'] += 1
+                self.app.logger.exception('Notification dispatch failed')
+                self._set_next_refill(datetime.utcnow() + timedelta(seconds=self.refill_seconds), requests_seen)
+
+            # Sleep until the next item is due, the next refill, or a new earlier item
+            with self._condition:
+                wake_at = self._next_refill
+                if self._heap:
+                    wake_at = min(wake_at, self._heap[0][0])
+                timeout = (wake_at - datetime.utcnow()).total_seconds()
+                if timeout > 0:
+                    self._condition.wait(timeout)
+
+
+notification_dispatcher = NotificationDispatcher()
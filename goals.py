@@ -1,17 +1,144 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import Goal, db
 from src.routes.auth import token_required
-from datetime import datetime
+from src.routes.pagination import page_response, paginate
+from src.routes.serialization import etag_by_data_version
+from datetime import datetime, timedelta
 import json
 
 goals_bp = Blueprint('goals', __name__)
 
+# Keyset pagination of a user's goals by (created_at, id)
+db.Index('ix_goal_user_created_id', Goal.user_id, Goal.created_at, Goal.id)
+
+# Goal types updated automatically from new health records:
+# goal_type -> (record_type, metric, aggregate, direction)
+#   aggregate: 'latest' value, or the sum over the current 'day' / 'week'
+#   direction: whether reaching the target means the value is 'at_least' or 'at_most' target_value
+GOAL_TRACKING = {
+    'weight_loss': ('weight', 'kg', 'latest', 'at_most'),
+    'weight_gain': ('weight', 'kg', 'latest', 'at_least'),
+    'exercise': ('exercise', 'minutes', 'week', 'at_least'),
+    'sleep': ('sleep', 'hours', 'latest', 'at_least'),
+    'water_intake': ('water_intake', 'glasses', 'day', 'at_least'),
+    'heart_rate': ('heart_rate', 'bpm', 'latest', 'at_most'),
+    'blood_pressure': ('blood_pressure', 'systolic', 'latest', 'at_most'),
+}
+
+
+class GoalProgress(db.Model):
+    """Running aggregate behind an automatically tracked goal.
+
+    Holds the latest value, or the running total of the current day/week, so
+    each new record updates the goal in constant time instead of re-reading
+    the user's history.
+    """
+    goal_id = db.Column(db.Integer, db.ForeignKey('goal.id', ondelete='CASCADE'), primary_key=True)
+    period_start = db.Column(db.DateTime)  # start of the day/week being summed
+    period_total = db.Column(db.Float, nullable=False, default=0)
+    period_count = db.Column(db.Integer, nullable=False, default=0)
+    last_value = db.Column(db.Float)
+    last_recorded_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def _period_start(recorded_at, aggregate):
+    day = recorded_at.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+    if aggregate == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def start_goal_progress(goal):
+    """Add the progress row of a newly flushed tracked goal, starting from its creation time."""
+    if goal.goal_type not in GOAL_TRACKING:
+        return None
+    aggregate = GOAL_TRACKING[goal.goal_type][2]
+    progress = GoalProgress(
+        goal_id=goal.id,
+        period_start=_period_start(goal.created_at, aggregate) if aggregate != 'latest' else None,
+        period_total=0,
+        period_count=0,
+        last_recorded_at=goal.created_at
+    )
+    db.session.add(progress)
+    return progress
+
+
+def track_goal_progress(user_id, observations):
+    """Fold new health observations into the user's active tracked goals; returns the goals completed.
+
+    ``observations`` are ``(record_type, recorded_at, metrics)`` tuples for
+    newly created records, with metrics as produced by
+    ``health.extract_metrics``. Observations recorded before a goal was
+    created (e.g. history uploaded by a device sync) do not count towards it.
+    Runs inside the caller's transaction.
+    """
+    record_types = {record_type for record_type, _, metrics in observations if metrics}
+    goal_types = [goal_type for goal_type, rule in GOAL_TRACKING.items() if rule[0] in record_types]
+    if not goal_types:
+        return []
+
+    goals = Goal.query.filter(
+        Goal.user_id == user_id,
+        Goal.status == 'active',
+        Goal.goal_type.in_(goal_types)
+    ).all()
+    if not goals:
+        return []
+
+    progress = {row.goal_id: row for row in GoalProgress.query.filter(GoalProgress.goal_id.in_([goal.id for goal in goals]))}
+    completed = []
+    for record_type, recorded_at, metrics in sorted(observations, key=lambda observation: observation[1].replace(tzinfo=None)):
+        recorded_at = recorded_at.replace(tzinfo=None)
+        for goal in goals:
+            tracked_type, metric, aggregate, direction = GOAL_TRACKING[goal.goal_type]
+            if goal.status != 'active' or tracked_type != record_type or metric not in metrics:
+                continue
+            if goal.created_at is not None and recorded_at < goal.created_at:
+                continue
+
+            row = progress.get(goal.id)
+            if row is None:
+                row = progress[goal.id] = GoalProgress(goal_id=goal.id, period_total=0, period_count=0)
+                db.session.add(row)
+
+            value = metrics[metric]
+            if aggregate == 'latest':
+                if row.last_recorded_at is not None and recorded_at < row.last_recorded_at:
+                    continue
+                current_value = value
+            else:
+                period_start = _period_start(recorded_at, aggregate)
+                if row.period_start is None or period_start > row.period_start:
+                    row.period_start, row.period_total, row.period_count = period_start, 0, 0
+                elif period_start < row.period_start:
+                    continue  # belongs to a period that has already closed
+                row.period_total += value
+                row.period_count += 1
+                current_value = row.period_total
+
+            row.last_value = value
+            row.last_recorded_at = max(recorded_at, row.last_recorded_at or recorded_at)
+            goal.current_value = current_value
+            goal.updated_at = datetime.utcnow()
+
+            if goal.target_value is not None:
+                reached = current_value <= goal.target_value if direction == 'at_most' else current_value >= goal.target_value
+                if reached:
+                    goal.status = 'completed'
+                    completed.append(goal)
+    return completed
+
 @goals_bp.route('', methods=['GET'])
 @token_required
+@etag_by_data_version()
 def get_goals(current_user):
     try:
         status = request.args.get('status')  # active, completed, paused, cancelled
         goal_type = request.args.get('type')
+        limit = request.args.get('limit', 100, type=int)
+        cursor = request.args.get('cursor')
         
         query = Goal.query.filter_by(user_id=current_user.id)
         
@@ -21,10 +148,12 @@ def get_goals(current_user):
         if goal_type:
             query = query.filter_by(goal_type=goal_type)
         
-        goals = query.order_by(Goal.created_at.desc()).all()
+        goals, next_cursor = paginate(query, Goal.created_at, Goal.id, cursor, limit)
         
-        return jsonify([goal.to_dict() for goal in goals]), 200
+        return page_response([goal.to_dict() for goal in goals], next_cursor), 200
         
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Failed to fetch goals: {str(e)}'}), 500
 
@@ -55,6 +184,8 @@ def create_goal(current_user):
         )
         
         db.session.add(goal)
+        db.session.flush()
+        start_goal_progress(goal)
         db.session.commit()
         
         return jsonify({
@@ -125,6 +256,8 @@ def delete_goal(current_user, goal_id):
         if not goal:
             return jsonify({'message': 'Goal not found'}), 404
         
+        # Not left to ON DELETE CASCADE: SQLite reuses the id for the next goal
+        GoalProgress.query.filter_by(goal_id=goal.id).delete(synchronize_session=False)
         db.session.delete(goal)
         db.session.commit()
         
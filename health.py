@@ -1,11 +1,323 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import HealthRecord, db
 from src.routes.auth import token_required
-from datetime import datetime, timedelta
+from src.routes.pagination import page_response, paginate
+from src.routes.serialization import etag_by_data_version
+from src.routes.goals import track_goal_progress
+from datetime import date, datetime, timedelta
+from sqlalchemy import case, func, insert
+from sqlalchemy.exc import IntegrityError
+import time
+import numpy as np
 import json
+import math
 
 health_bp = Blueprint('health', __name__)
 
+RECORD_TYPES = ['blood_pressure', 'heart_rate', 'weight', 'exercise', 'diet', 'medication', 'symptoms', 'sleep', 'water_intake']
+
+# Covers the per-user, per-type "latest record" and date-range lookups
+db.Index('ix_health_record_user_type_recorded', HealthRecord.user_id, HealthRecord.record_type, HealthRecord.recorded_at)
+# Keyset pagination of a user's records by (recorded_at, id)
+db.Index('ix_health_record_user_recorded_id', HealthRecord.user_id, HealthRecord.recorded_at, HealthRecord.id)
+
+# Numeric fields charted per record type; the first one is used when a record's value is a bare number
+METRIC_FIELDS = {
+    'blood_pressure': ('systolic', 'diastolic'),
+    'heart_rate': ('bpm',),
+    'weight': ('kg',),
+    'exercise': ('minutes',),
+    'sleep': ('hours',),
+    'water_intake': ('glasses',),
+}
+
+TREND_BUCKETS = ['hour', 'day', 'week']
+MAX_HOURLY_TREND_DAYS = 31
+
+MAX_BATCH_RECORDS = 5000
+BATCH_CHUNK_SIZE = 500
+
+
+class HealthDailyRollup(db.Model):
+    """Count, sum, min and max of one metric of one record type for one user and UTC day.
+
+    Kept up to date as records are created, updated and deleted, so day and
+    week trends read at most one row per day instead of every raw record.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    record_type = db.Column(db.String(50), nullable=False)
+    metric = db.Column(db.String(30), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Float, nullable=False, default=0)
+    minimum = db.Column(db.Float)
+    maximum = db.Column(db.Float)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'record_type', 'metric', 'day', name='uq_health_rollup_user_type_metric_day'),
+    )
+
+
+class HealthMeasurement(db.Model):
+    """One numeric metric of a health record (e.g. a heart rate record's bpm), stored as a float.
+
+    Written alongside the record so range filters and aggregates run in SQL
+    instead of decoding the JSON ``value`` of every row.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    record_id = db.Column(db.Integer, db.ForeignKey('health_record.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    record_type = db.Column(db.String(50), nullable=False)
+    metric = db.Column(db.String(30), nullable=False)
+    value = db.Column(db.Float, nullable=False)
+    recorded_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_health_measurement_user_type_metric_recorded', 'user_id', 'record_type', 'metric', 'recorded_at'),
+        db.Index('ix_health_measurement_user_metric_value', 'user_id', 'metric', 'value'),
+    )
+
+
+class HealthRecordIngestKey(db.Model):
+    """Client-supplied idempotency key of a batch-ingested record, so retried uploads are not stored twice."""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    key = db.Column(db.String(100), nullable=False)
+    record_id = db.Column(db.Integer, db.ForeignKey('health_record.id', ondelete='CASCADE'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'key', name='uq_health_ingest_key_user_key'),
+    )
+
+
+def _to_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, str)):
+        try:
+            number = float(value)
+        except ValueError:
+            return None
+        return number if math.isfinite(number) else None
+    return None
+
+
+def extract_metrics(record_type, value):
+    """Map a record value to the numeric metrics charted for its type, e.g. {'systolic': 120.0, 'diastolic': 80.0}."""
+    fields = METRIC_FIELDS.get(record_type)
+    if not fields:
+        return {}
+
+    if isinstance(value, dict):
+        metrics = {field: _to_number(value.get(field)) for field in fields}
+        if metrics[fields[0]] is None:
+            metrics[fields[0]] = _to_number(value.get('value'))
+    elif record_type == 'blood_pressure' and isinstance(value, str) and '/' in value:
+        systolic, _, diastolic = value.partition('/')
+        metrics = {'systolic': _to_number(systolic.strip()), 'diastolic': _to_number(diastolic.strip())}
+    else:
+        metrics = {fields[0]: _to_number(value)}
+
+    return {metric: number for metric, number in metrics.items() if number is not None}
+
+
+def _increment_rollup(key, number):
+    """Add one value to an existing rollup row in a single UPDATE; returns the number of rows updated."""
+    return HealthDailyRollup.query.filter_by(**key).update({
+        HealthDailyRollup.count: HealthDailyRollup.count + 1,
+        HealthDailyRollup.total: HealthDailyRollup.total + number,
+        HealthDailyRollup.minimum: case((HealthDailyRollup.minimum <= number, HealthDailyRollup.minimum), else_=number),
+        HealthDailyRollup.maximum: case((HealthDailyRollup.maximum >= number, HealthDailyRollup.maximum), else_=number),
+    }, synchronize_session=False)
+
+
+def add_to_daily_rollups(record):
+    """Fold a new record into its day's rollups.
+
+    Updates are done in SQL so concurrent writes for the same day are not
+    lost; the day's first record inserts the row instead.
+    """
+    day = record.recorded_at.date()
+    for metric, number in extract_metrics(record.record_type, json.loads(record.value)).items():
+        key = {'user_id': record.user_id, 'record_type': record.record_type, 'metric': metric, 'day': day}
+        if _increment_rollup(key, number):
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(HealthDailyRollup).values(
+                    **key, count=1, total=number, minimum=number, maximum=number
+                ))
+        except IntegrityError:
+            # Created concurrently; add to that row instead
+            _increment_rollup(key, number)
+
+
+def write_measurements(record):
+    """Replace the typed measurements of a flushed record with those parsed from its value."""
+    HealthMeasurement.query.filter_by(record_id=record.id).delete(synchronize_session=False)
+    metrics = extract_metrics(record.record_type, json.loads(record.value))
+    if metrics:
+        db.session.execute(insert(HealthMeasurement), [
+            {'record_id': record.id, 'user_id': record.user_id, 'record_type': record.record_type,
+             'metric': metric, 'value': number, 'recorded_at': record.recorded_at}
+            for metric, number in metrics.items()
+        ])
+
+
+def backfill_measurements(batch_size=1000):
+    """Populate measurements for every existing record, walking the table in id order."""
+    last_id, written = 0, 0
+    while True:
+        records = db.session.query(
+            HealthRecord.id, HealthRecord.user_id, HealthRecord.record_type, HealthRecord.value, HealthRecord.recorded_at
+        ).filter(
+            HealthRecord.id > last_id,
+            HealthRecord.record_type.in_(list(METRIC_FIELDS))
+        ).order_by(HealthRecord.id).limit(batch_size).all()
+        if not records:
+            return written
+
+        ids = [record.id for record in records]
+        HealthMeasurement.query.filter(HealthMeasurement.record_id.in_(ids)).delete(synchronize_session=False)
+        rows = []
+        for record_id, user_id, record_type, value, recorded_at in records:
+            try:
+                metrics = extract_metrics(record_type, json.loads(value))
+            except ValueError:
+                continue
+            rows.extend(
+                {'record_id': record_id, 'user_id': user_id, 'record_type': record_type,
+                 'metric': metric, 'value': number, 'recorded_at': recorded_at}
+                for metric, number in metrics.items()
+            )
+        if rows:
+            db.session.execute(insert(HealthMeasurement), rows)
+        db.session.commit()
+        written += len(rows)
+        last_id = ids[-1]
+
+
+def rebuild_daily_rollups(user_id, record_type=None, days=None):
+    """Recompute rollups from measurements for the given days (all days when None).
+
+    Used after updates and deletes, where min/max cannot be adjusted
+    incrementally, and to backfill rollups for existing records.
+    """
+    rollups = HealthDailyRollup.query.filter(HealthDailyRollup.user_id == user_id)
+    day = func.date(HealthMeasurement.recorded_at)
+    stats = db.session.query(
+        HealthMeasurement.record_type, HealthMeasurement.metric, day,
+        func.count(HealthMeasurement.id), func.sum(HealthMeasurement.value),
+        func.min(HealthMeasurement.value), func.max(HealthMeasurement.value)
+    ).filter(HealthMeasurement.user_id == user_id)
+    if record_type:
+        rollups = rollups.filter(HealthDailyRollup.record_type == record_type)
+        stats = stats.filter(HealthMeasurement.record_type == record_type)
+    if days:
+        days = set(days)
+        rollups = rollups.filter(HealthDailyRollup.day.in_(days))
+        stats = stats.filter(
+            HealthMeasurement.recorded_at >= datetime.combine(min(days), datetime.min.time()),
+            HealthMeasurement.recorded_at < datetime.combine(max(days), datetime.min.time()) + timedelta(days=1)
+        )
+    rollups.delete(synchronize_session=False)
+
+    rows = []
+    for row_type, metric, row_day, count, total, minimum, maximum in stats.group_by(
+            HealthMeasurement.record_type, HealthMeasurement.metric, day):
+        # SQLite returns DATE() as text
+        row_day = date.fromisoformat(row_day) if isinstance(row_day, str) else row_day
+        if days and row_day not in days:
+            continue
+        rows.append({'user_id': user_id, 'record_type': row_type, 'metric': metric, 'day': row_day,
+                     'count': count, 'total': total, 'minimum': minimum, 'maximum': maximum})
+
+    if rows:
+        db.session.execute(insert(HealthDailyRollup), rows)
+    return len(rows)
+
+
+def aggregate_buckets(keys, counts, totals, minimums, maximums):
+    """Combine rows that share a bucket key; all arrays are aligned and sorted by key."""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return (
+        keys[starts],
+        np.add.reduceat(counts, starts),
+        np.add.reduceat(totals, starts),
+        np.minimum.reduceat(minimums, starts),
+        np.maximum.reduceat(maximums, starts),
+    )
+
+
+def bucket_series(keys, counts, totals, minimums, maximums):
+    keys, counts, totals, minimums, maximums = aggregate_buckets(keys, counts, totals, minimums, maximums)
+    means = totals / counts
+    return [
+        {
+            'start': start.isoformat(),
+            'count': int(count),
+            'min': float(minimum),
+            'max': float(maximum),
+            'mean': round(float(mean), 3)
+        }
+        for start, count, minimum, maximum, mean in zip(keys.astype(object), counts, minimums, maximums, means)
+    ]
+
+
+def build_bucketed_trends(user, record_type, start_date, bucket):
+    """Per-metric min/max/mean/count series; hourly buckets read measurements, day and week read rollups."""
+    series = {}
+    if bucket == 'hour':
+        measurements = db.session.query(
+            HealthMeasurement.metric, HealthMeasurement.recorded_at, HealthMeasurement.value
+        ).filter(
+            HealthMeasurement.user_id == user.id,
+            HealthMeasurement.record_type == record_type,
+            HealthMeasurement.recorded_at >= start_date
+        ).order_by(HealthMeasurement.metric, HealthMeasurement.recorded_at).all()
+
+        points = {}
+        for metric, recorded_at, value in measurements:
+            points.setdefault(metric, ([], []))
+            points[metric][0].append(recorded_at)
+            points[metric][1].append(value)
+
+        for metric, (timestamps, values) in points.items():
+            values = np.asarray(values, dtype=np.float64)
+            keys = np.asarray(timestamps, dtype='datetime64[h]')
+            series[metric] = bucket_series(keys, np.ones(len(values), dtype=np.int64), values, values, values)
+        return series
+
+    rollups = db.session.query(
+        HealthDailyRollup.metric, HealthDailyRollup.day, HealthDailyRollup.count,
+        HealthDailyRollup.total, HealthDailyRollup.minimum, HealthDailyRollup.maximum
+    ).filter(
+        HealthDailyRollup.user_id == user.id,
+        HealthDailyRollup.record_type == record_type,
+        HealthDailyRollup.day >= start_date.date()
+    ).order_by(HealthDailyRollup.metric, HealthDailyRollup.day).all()
+
+    by_metric = {}
+    for metric, *row in rollups:
+        by_metric.setdefault(metric, []).append(row)
+
+    for metric, rows in by_metric.items():
+        days, counts, totals, minimums, maximums = zip(*rows)
+        keys = np.asarray(days, dtype='datetime64[D]')
+        if bucket == 'week':
+            # Monday-based weeks; 1970-01-01 was a Thursday
+            keys = keys - (keys.astype(np.int64) + 3) % 7
+        series[metric] = bucket_series(
+            keys,
+            np.asarray(counts, dtype=np.int64),
+            np.asarray(totals, dtype=np.float64),
+            np.asarray(minimums, dtype=np.float64),
+            np.asarray(maximums, dtype=np.float64)
+        )
+    return series
+
 @health_bp.route('/records', methods=['GET'])
 @token_required
 def get_health_records(current_user):
@@ -15,6 +327,10 @@ def get_health_records(current_user):
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         limit = request.args.get('limit', 100, type=int)
+        cursor = request.args.get('cursor')
+        metric = request.args.get('metric')  # systolic, diastolic, bpm, kg, minutes, hours, glasses
+        min_value = request.args.get('min_value', type=float)
+        max_value = request.args.get('max_value', type=float)
         
         # Build query
         query = HealthRecord.query.filter_by(user_id=current_user.id)
@@ -22,6 +338,16 @@ def get_health_records(current_user):
         if record_type:
             query = query.filter_by(record_type=record_type)
         
+        if metric:
+            query = query.join(HealthMeasurement, HealthMeasurement.record_id == HealthRecord.id).filter(
+                HealthMeasurement.user_id == current_user.id,
+                HealthMeasurement.metric == metric
+            )
+            if min_value is not None:
+                query = query.filter(HealthMeasurement.value >= min_value)
+            if max_value is not None:
+                query = query.filter(HealthMeasurement.value <= max_value)
+        
         if start_date:
             start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
             query = query.filter(HealthRecord.recorded_at >= start_date)
@@ -30,10 +356,12 @@ def get_health_records(current_user):
             end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
             query = query.filter(HealthRecord.recorded_at <= end_date)
         
-        records = query.order_by(HealthRecord.recorded_at.desc()).limit(limit).all()
+        records, next_cursor = paginate(query, HealthRecord.recorded_at, HealthRecord.id, cursor, limit)
         
-        return jsonify([record.to_dict() for record in records]), 200
+        return page_response([record.to_dict() for record in records], next_cursor), 200
         
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Failed to fetch health records: {str(e)}'}), 500
 
@@ -47,7 +375,7 @@ def create_health_record(current_user):
             return jsonify({'message': 'Record type and value are required'}), 400
         
         # Validate record type
-        valid_types = ['blood_pressure', 'heart_rate', 'weight', 'exercise', 'diet', 'medication', 'symptoms', 'sleep', 'water_intake']
+        valid_types = RECORD_TYPES
         if data['record_type'] not in valid_types:
             return jsonify({'message': f'Invalid record type. Must be one of: {", ".join(valid_types)}'}), 400
         
@@ -60,16 +388,177 @@ def create_health_record(current_user):
         )
         
         db.session.add(record)
+        db.session.flush()
+        write_measurements(record)
+        add_to_daily_rollups(record)
+        completed_goals = [goal.id for goal in track_goal_progress(current_user.id, [
+            (record.record_type, record.recorded_at, extract_metrics(record.record_type, data['value']))
+        ])]
         db.session.commit()
         
         return jsonify({
             'message': 'Health record created successfully',
-            'record': record.to_dict()
+            'record': record.to_dict(),
+            'completed_goals': completed_goals
         }), 201
         
     except Exception as e:
         return jsonify({'message': f'Failed to create health record: {str(e)}'}), 500
 
+def parse_batch_body():
+    """Records from a JSON array, a ``{"records": [...]}`` object or an NDJSON body (one record per line)."""
+    if request.mimetype in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+        items = []
+        for line in request.get_data(as_text=True).splitlines():
+            if line.strip():
+                items.append(json.loads(line))
+        return items
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('records')
+    if not isinstance(data, list):
+        raise ValueError('Body must be a JSON array of records, {"records": [...]} or NDJSON')
+    return data
+
+
+def validate_batch_item(item):
+    """Return (record fields, idempotency key) for one batch item; ValueError if it is invalid."""
+    if not isinstance(item, dict):
+        raise ValueError('Record must be an object')
+    if not item.get('record_type') or item.get('value') in (None, ''):
+        raise ValueError('Record type and value are required')
+    if item['record_type'] not in RECORD_TYPES:
+        raise ValueError(f'Invalid record type. Must be one of: {", ".join(RECORD_TYPES)}')
+
+    key = item.get('idempotency_key')
+    if key is not None and (not isinstance(key, str) or not key or len(key) > 100):
+        raise ValueError('idempotency_key must be a non-empty string of at most 100 characters')
+    if item.get('notes') is not None and not isinstance(item['notes'], str):
+        raise ValueError('notes must be a string')
+    if item.get('recorded_at') and not isinstance(item['recorded_at'], str):
+        raise ValueError('recorded_at must be an ISO 8601 datetime string')
+
+    return {
+        'record_type': item['record_type'],
+        'value': json.dumps(item['value']),
+        'notes': item.get('notes'),
+        'recorded_at': datetime.fromisoformat(item['recorded_at'].replace('Z', '+00:00')) if item.get('recorded_at') else datetime.utcnow()
+    }, key
+
+
+def _existing_ingest_keys(user_id, keys):
+    if not keys:
+        return {}
+    return dict(db.session.query(HealthRecordIngestKey.key, HealthRecordIngestKey.record_id).filter(
+        HealthRecordIngestKey.user_id == user_id,
+        HealthRecordIngestKey.key.in_(keys)
+    ).all())
+
+
+def ingest_chunk(user_id, chunk, results):
+    """Insert one chunk of validated (index, fields, key) items in a single transaction."""
+    existing = _existing_ingest_keys(user_id, [key for _, _, key in chunk if key])
+    pending = []
+    for index, fields, key in chunk:
+        if key in existing:
+            results[index] = {'index': index, 'status': 'duplicate', 'id': existing[key]}
+        else:
+            pending.append((index, HealthRecord(user_id=user_id, **fields), key))
+    if not pending:
+        return 0
+
+    db.session.add_all([record for _, record, _ in pending])
+    db.session.flush()
+
+    keys, measurements, touched_days, observations = [], [], {}, []
+    for _, record, key in pending:
+        if key:
+            keys.append({'user_id': user_id, 'key': key, 'record_id': record.id})
+        metrics = extract_metrics(record.record_type, json.loads(record.value))
+        observations.append((record.record_type, record.recorded_at, metrics))
+        measurements.extend(
+            {'record_id': record.id, 'user_id': user_id, 'record_type': record.record_type,
+             'metric': metric, 'value': number, 'recorded_at': record.recorded_at}
+            for metric, number in metrics.items()
+        )
+        if metrics:
+            touched_days.setdefault(record.record_type, set()).add(record.recorded_at.date())
+
+    if keys:
+        db.session.execute(insert(HealthRecordIngestKey), keys)
+    if measurements:
+        db.session.execute(insert(HealthMeasurement), measurements)
+    for record_type, days in touched_days.items():
+        rebuild_daily_rollups(user_id, record_type, days)
+    track_goal_progress(user_id, observations)
+
+    # Read ids before commit expires the objects
+    created = [(index, record.id) for index, record, _ in pending]
+    db.session.commit()
+
+    for index, record_id in created:
+        results[index] = {'index': index, 'status': 'created', 'id': record_id}
+    return len(created)
+
+
+@health_bp.route('/records/batch', methods=['POST'])
+@token_required
+def create_health_records_batch(current_user):
+    try:
+        started = time.perf_counter()
+        try:
+            items = parse_batch_body()
+        except ValueError as e:
+            return jsonify({'message': f'Invalid batch: {str(e)}'}), 400
+        
+        if not items:
+            return jsonify({'message': 'No records supplied'}), 400
+        if len(items) > MAX_BATCH_RECORDS:
+            return jsonify({'message': f'At most {MAX_BATCH_RECORDS} records per batch'}), 400
+        
+        # Validate everything up front; keys repeated within the batch refer to their first occurrence
+        results = [None] * len(items)
+        valid, first_index = [], {}
+        for index, item in enumerate(items):
+            try:
+                fields, key = validate_batch_item(item)
+            except ValueError as e:
+                results[index] = {'index': index, 'status': 'invalid', 'error': str(e)}
+                continue
+            if key in first_index:
+                results[index] = {'index': index, 'status': 'duplicate', 'duplicate_of': first_index[key]}
+                continue
+            if key:
+                first_index[key] = index
+            valid.append((index, fields, key))
+        
+        created = 0
+        for start in range(0, len(valid), BATCH_CHUNK_SIZE):
+            chunk = valid[start:start + BATCH_CHUNK_SIZE]
+            try:
+                created += ingest_chunk(current_user.id, chunk, results)
+            except IntegrityError:
+                # A concurrent upload stored some of these keys first; retry so they resolve as duplicates
+                db.session.rollback()
+                created += ingest_chunk(current_user.id, chunk, results)
+        
+        elapsed = time.perf_counter() - started
+        statuses = [result['status'] for result in results]
+        return jsonify({
+            'message': f'Ingested {created} health records',
+            'created': created,
+            'duplicates': statuses.count('duplicate'),
+            'invalid': statuses.count('invalid'),
+            'results': results,
+            'seconds': round(elapsed, 4),
+            'rows_per_sec': round(created / elapsed, 1) if elapsed > 0 else None
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': f'Failed to ingest health records: {str(e)}'}), 500
+
 @health_bp.route('/records/<int:record_id>', methods=['GET'])
 @token_required
 def get_health_record(current_user, record_id):
@@ -94,6 +583,7 @@ def update_health_record(current_user, record_id):
             return jsonify({'message': 'Health record not found'}), 404
         
         data = request.json
+        previous_day = record.recorded_at.date()
         
         if 'value' in data:
             record.value = json.dumps(data['value'])
@@ -102,6 +592,10 @@ def update_health_record(current_user, record_id):
         if 'recorded_at' in data:
             record.recorded_at = datetime.fromisoformat(data['recorded_at'].replace('Z', '+00:00'))
         
+        if 'value' in data or 'recorded_at' in data:
+            db.session.flush()
+            write_measurements(record)
+            rebuild_daily_rollups(current_user.id, record.record_type, {previous_day, record.recorded_at.date()})
         db.session.commit()
         
         return jsonify({
@@ -121,7 +615,11 @@ def delete_health_record(current_user, record_id):
         if not record:
             return jsonify({'message': 'Health record not found'}), 404
         
+        HealthMeasurement.query.filter_by(record_id=record.id).delete(synchronize_session=False)
+        HealthRecordIngestKey.query.filter_by(record_id=record.id).delete(synchronize_session=False)
         db.session.delete(record)
+        db.session.flush()
+        rebuild_daily_rollups(current_user.id, record.record_type, {record.recorded_at.date()})
         db.session.commit()
         
         return jsonify({'message': 'Health record deleted successfully'}), 200
@@ -129,48 +627,61 @@ def delete_health_record(current_user, record_id):
     except Exception as e:
         return jsonify({'message': f'Failed to delete health record: {str(e)}'}), 500
 
+def build_health_summary(user):
+    """Latest record, 7-day count and total count per record type in a single query."""
+    cutoff = datetime.utcnow() - timedelta(days=7)
+    by_type = HealthRecord.record_type
+
+    ranked = db.session.query(
+        HealthRecord.id.label('id'),
+        func.row_number().over(
+            partition_by=by_type,
+            order_by=(HealthRecord.recorded_at.desc(), HealthRecord.id.desc())
+        ).label('rank'),
+        func.count(HealthRecord.id).over(partition_by=by_type).label('total'),
+        func.sum(case((HealthRecord.recorded_at >= cutoff, 1), else_=0)).over(partition_by=by_type).label('recent')
+    ).filter(HealthRecord.user_id == user.id).subquery()
+
+    rows = db.session.query(HealthRecord, ranked.c.total, ranked.c.recent).join(
+        ranked, HealthRecord.id == ranked.c.id
+    ).filter(ranked.c.rank == 1).all()
+
+    latest_by_type = {record.record_type: (record, recent) for record, _, recent in rows}
+    total_records = sum(total for _, total, _ in rows)
+
+    summary = {}
+    for record_type in RECORD_TYPES:
+        if record_type in latest_by_type:
+            latest_record, recent = latest_by_type[record_type]
+            summary[record_type] = {
+                'latest': latest_record.to_dict(),
+                'count_last_7_days': int(recent or 0)
+            }
+        else:
+            summary[record_type] = {
+                'latest': None,
+                'count_last_7_days': 0
+            }
+
+    # Calculate BMI if height and weight are available
+    bmi = None
+    if user.height and user.weight:
+        height_m = user.height / 100  # convert cm to m
+        bmi = round(user.weight / (height_m ** 2), 1)
+
+    return {
+        'user_profile': user.to_dict_safe(),
+        'bmi': bmi,
+        'health_records_summary': summary,
+        'total_records': int(total_records)
+    }
+
 @health_bp.route('/summary', methods=['GET'])
 @token_required
+@etag_by_data_version()
 def get_health_summary(current_user):
     try:
-        # Get recent records for each type
-        summary = {}
-        record_types = ['blood_pressure', 'heart_rate', 'weight', 'exercise', 'diet', 'medication', 'symptoms', 'sleep', 'water_intake']
-        
-        for record_type in record_types:
-            latest_record = HealthRecord.query.filter_by(
-                user_id=current_user.id,
-                record_type=record_type
-            ).order_by(HealthRecord.recorded_at.desc()).first()
-            
-            if latest_record:
-                summary[record_type] = {
-                    'latest': latest_record.to_dict(),
-                    'count_last_7_days': HealthRecord.query.filter_by(
-                        user_id=current_user.id,
-                        record_type=record_type
-                    ).filter(
-                        HealthRecord.recorded_at >= datetime.utcnow() - timedelta(days=7)
-                    ).count()
-                }
-            else:
-                summary[record_type] = {
-                    'latest': None,
-                    'count_last_7_days': 0
-                }
-        
-        # Calculate BMI if height and weight are available
-        bmi = None
-        if current_user.height and current_user.weight:
-            height_m = current_user.height / 100  # convert cm to m
-            bmi = round(current_user.weight / (height_m ** 2), 1)
-        
-        return jsonify({
-            'user_profile': current_user.to_dict_safe(),
-            'bmi': bmi,
-            'health_records_summary': summary,
-            'total_records': HealthRecord.query.filter_by(user_id=current_user.id).count()
-        }), 200
+        return jsonify(build_health_summary(current_user)), 200
         
     except Exception as e:
         return jsonify({'message': f'Failed to generate health summary: {str(e)}'}), 500
@@ -181,9 +692,23 @@ def get_health_trends(current_user):
     try:
         record_type = request.args.get('type', 'weight')
         days = request.args.get('days', 30, type=int)
+        bucket = request.args.get('bucket')
         
         start_date = datetime.utcnow() - timedelta(days=days)
         
+        if bucket:
+            if bucket not in TREND_BUCKETS:
+                return jsonify({'message': f'Invalid bucket. Must be one of: {", ".join(TREND_BUCKETS)}'}), 400
+            if bucket == 'hour' and days > MAX_HOURLY_TREND_DAYS:
+                return jsonify({'message': f'Hourly trends are limited to {MAX_HOURLY_TREND_DAYS} days'}), 400
+            
+            return jsonify({
+                'record_type': record_type,
+                'period_days': days,
+                'bucket': bucket,
+                'series': build_bucketed_trends(current_user, record_type, start_date, bucket)
+            }), 200
+        
         records = HealthRecord.query.filter_by(
             user_id=current_user.id,
             record_type=record_type
@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import sys
 # DON'T CHANGE THIS !!!
@@ -5,23 +6,55 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from flask import Flask, send_from_directory
 from flask_cors import CORS
-from src.models.user import db
+from src.models.user import User, db
 from src.routes.user import user_bp
 from src.routes.auth import auth_bp
-from src.routes.health import health_bp
+from src.routes.health import backfill_measurements, health_bp, rebuild_daily_rollups
 from src.routes.goals import goals_bp
 from src.routes.notifications import notifications_bp
+from src.routes.predict import predict_bp
+from src.routes.dashboard import dashboard_bp
+from src.routes.dispatcher import notification_dispatcher
+from src.routes.serialization import FastJSONProvider
+from src.routes.database import configure_sqlite, database_url_from_env, engine_options_from_env
+from src.routes.password_hashing import DEFAULT_METHOD, password_hasher
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'health_bot_secret_key_2024'
 
+# orjson-backed jsonify when orjson is installed
+app.json = FastJSONProvider(app)
+
+# Operator metrics endpoints (*-stats) require this value in the X-Ops-Token header
+app.config['OPS_TOKEN'] = os.environ.get('OPS_TOKEN')
+
 # Enable CORS for all routes
-CORS(app)
+CORS(app, expose_headers=['X-Next-Cursor'])
 
-# SQLite database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///health_bot.db'
+# Database configuration (DATABASE_URL, default SQLite; pool and SQLite tuning via DB_*/SQLITE_*)
+app.config['SQLALCHEMY_DATABASE_URI'] = database_url_from_env()
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options_from_env(app.config['SQLALCHEMY_DATABASE_URI'])
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Mental health predictor micro-batching
+app.config['PREDICT_MAX_BATCH_SIZE'] = int(os.environ.get('PREDICT_MAX_BATCH_SIZE', 32))
+app.config['PREDICT_MAX_WAIT_MS'] = float(os.environ.get('PREDICT_MAX_WAIT_MS', 5))
+app.config['PREDICT_TIMEOUT'] = float(os.environ.get('PREDICT_TIMEOUT', 10))
+app.config['MODEL_ARTIFACT_PATH'] = os.environ.get('MODEL_ARTIFACT_PATH')
+app.config['PREDICTION_CACHE_SIZE'] = int(os.environ.get('PREDICTION_CACHE_SIZE', 10000))
+app.config['PREDICTION_CACHE_TTL'] = int(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+app.config['PREDICTION_CACHE_PATH'] = os.environ.get('PREDICTION_CACHE_PATH')
+
+# Threads used to build dashboard sections concurrently
+app.config['DASHBOARD_WORKERS'] = int(os.environ.get('DASHBOARD_WORKERS', 4))
+
+# Password hashing runs on a separate process pool; requests beyond the queue limit get a 503
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+app.config['PASSWORD_HASH_QUEUE_LIMIT'] = int(os.environ.get('PASSWORD_HASH_QUEUE_LIMIT', 16))
+app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+password_hasher.init_app(app)
+
 # Initialize database
 db.init_app(app)
 
@@ -31,10 +64,36 @@ app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(health_bp, url_prefix='/api/health')
 app.register_blueprint(goals_bp, url_prefix='/api/goals')
 app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
+app.register_blueprint(predict_bp, url_prefix='/api/predict')
+app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
 
 # Create database tables
 with app.app_context():
+    configure_sqlite(db.engine)
     db.create_all()
+    # create_all() skips existing tables, so add indexes introduced since they were created
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+# Background delivery of due notifications (set NOTIFICATION_DISPATCHER=0 to disable).
+# Password hashing workers re-import this module when it is run as a script; they skip it.
+app.config['NOTIFICATION_REFILL_SECONDS'] = int(os.environ.get('NOTIFICATION_REFILL_SECONDS', 30))
+if os.environ.get('NOTIFICATION_DISPATCHER', '1') == '1' and multiprocessing.parent_process() is None:
+    notification_dispatcher.init_app(app)
+
+@app.cli.command('backfill-health-measurements')
+def backfill_health_measurements():
+    """Populate typed measurements for health records written before they existed."""
+    print(f'Wrote {backfill_measurements()} health measurements')
+
+@app.cli.command('rebuild-health-rollups')
+def rebuild_health_rollups():
+    """Recompute the daily health rollups used by trend analytics from measurements."""
+    for (user_id,) in db.session.query(User.id).all():
+        rebuild_daily_rollups(user_id)
+        db.session.commit()
+    print('Health rollups rebuilt')
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
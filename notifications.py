@@ -1,18 +1,151 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from src.models.user import Notification, db
-from src.routes.auth import token_required
-from datetime import datetime, timedelta
+from src.routes.auth import ops_required, token_required
+from src.routes.dispatcher import claim_pending_notifications, notification_dispatcher
+from src.routes.pagination import page_response, paginate
+from src.routes.serialization import bump_data_version, etag_by_data_version
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert, or_
+import queue
 import json
 
 notifications_bp = Blueprint('notifications', __name__)
 
+# Keyset pagination of a user's notifications by (created_at, id)
+db.Index('ix_notification_user_created_id', Notification.user_id, Notification.created_at, Notification.id)
+
+
+def _local_to_utc(value):
+    """Naive server-local time -> naive UTC, the form every stored timestamp uses."""
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _utc_to_local(value):
+    return value.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+class MedicationSchedule(db.Model):
+    """Daily recurring medication reminder: a list of times of day between two dates.
+
+    Occurrences are not stored up front. They are written as Notification rows
+    only once they are due (see ``materialize_due_reminders``), and
+    ``materialized_until`` records how far that has happened.
+
+    Dates and times of day are server local time, like the reminders this
+    replaces; ``ends_at``, ``materialized_until`` and the occurrences'
+    ``scheduled_for`` are UTC, like every other stored timestamp.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)
+    medication_name = db.Column(db.String(200), nullable=False)
+    dosage = db.Column(db.String(100), nullable=False)
+    times = db.Column(db.Text, nullable=False)  # JSON list of "HH:MM" strings
+    start_date = db.Column(db.DateTime, nullable=False)  # local midnight of the first day
+    end_date = db.Column(db.DateTime, nullable=False)  # local midnight of the last day (inclusive)
+    ends_at = db.Column(db.DateTime, nullable=False)  # last occurrence (UTC)
+    materialized_until = db.Column(db.DateTime)  # UTC
+    status = db.Column(db.String(20), default='active')  # active, cancelled
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def time_of_day(self):
+        return sorted(tuple(map(int, time_str.split(':'))) for time_str in json.loads(self.times))
+
+    def occurrences(self, after=None, until=None):
+        """Yield UTC occurrence datetimes in (after, until], in order; both bounds are UTC."""
+        times = self.time_of_day()
+        day = self.start_date
+        if after:
+            # Start from the local day before ``after`` so no occurrence is skipped across a DST change
+            after_day = _utc_to_local(after).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+            day = max(day, after_day)
+        while day <= self.end_date:
+            for hour, minute in times:
+                occurrence = _local_to_utc(day.replace(hour=hour, minute=minute))
+                if after and occurrence <= after:
+                    continue
+                if until and occurrence > until:
+                    return
+                yield occurrence
+            day += timedelta(days=1)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'medication_name': self.medication_name,
+            'dosage': self.dosage,
+            'times': json.loads(self.times),
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'materialized_until': self.materialized_until.isoformat() if self.materialized_until else None,
+            'status': self.status,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+
+def materialize_due_reminders(user_id=None, until=None):
+    """Write Notification rows for schedule occurrences that are due, in one bulk INSERT.
+
+    Without ``user_id`` every user's schedules are processed (used by the
+    dispatcher). ``until`` is UTC and defaults to now.
+
+    Several requests and dispatcher processes may run this at once, so each
+    schedule's window is claimed with a compare-and-set on
+    ``materialized_until`` first; only the caller that moved it writes the
+    occurrences.
+    """
+    until = until or datetime.utcnow()
+    query = MedicationSchedule.query.filter(
+        MedicationSchedule.status == 'active',
+        MedicationSchedule.start_date <= _utc_to_local(until),
+        or_(MedicationSchedule.materialized_until.is_(None),
+            (MedicationSchedule.materialized_until < MedicationSchedule.ends_at) &
+            (MedicationSchedule.materialized_until < until))
+    )
+    if user_id is not None:
+        query = query.filter(MedicationSchedule.user_id == user_id)
+    schedules = query.all()
+
+    rows = []
+    for schedule in schedules:
+        previous = schedule.materialized_until
+        claimed = MedicationSchedule.query.filter(
+            MedicationSchedule.id == schedule.id,
+            MedicationSchedule.materialized_until.is_(None) if previous is None
+            else MedicationSchedule.materialized_until == previous
+        ).update({'materialized_until': min(until, schedule.ends_at)}, synchronize_session=False)
+        if not claimed:
+            continue  # another caller materialized this window first
+
+        for occurrence in schedule.occurrences(after=previous, until=until):
+            rows.append({
+                'user_id': schedule.user_id,
+                'type': 'reminder',
+                'title': f'Medication Reminder: {schedule.medication_name}',
+                'message': f'Time to take your {schedule.medication_name} ({schedule.dosage})',
+                'scheduled_for': occurrence,
+                'priority': 'high',
+                'status': 'pending'
+            })
+
+    if rows:
+        db.session.execute(insert(Notification), rows)
+        bump_data_version(row['user_id'] for row in rows)
+    return len(rows)
+
+def _materialize_for(user):
+    if materialize_due_reminders(user.id):
+        db.session.commit()
+
 @notifications_bp.route('', methods=['GET'])
 @token_required
+@etag_by_data_version(prepare=_materialize_for)
 def get_notifications(current_user):
     try:
         status = request.args.get('status')  # pending, sent, read, dismissed
         notification_type = request.args.get('type')  # reminder, alert, motivation, instruction
         limit = request.args.get('limit', 50, type=int)
+        cursor = request.args.get('cursor')
         
         query = Notification.query.filter_by(user_id=current_user.id)
         
@@ -22,10 +155,12 @@ def get_notifications(current_user):
         if notification_type:
             query = query.filter_by(type=notification_type)
         
-        notifications = query.order_by(Notification.created_at.desc()).limit(limit).all()
+        notifications, next_cursor = paginate(query, Notification.created_at, Notification.id, cursor, limit)
         
-        return jsonify([notification.to_dict() for notification in notifications]), 200
+        return page_response([notification.to_dict() for notification in notifications], next_cursor), 200
         
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': f'Failed to fetch notifications: {str(e)}'}), 500
 
@@ -55,6 +190,7 @@ def create_notification(current_user):
         
         db.session.add(notification)
         db.session.commit()
+        notification_dispatcher.schedule(notification)
         
         return jsonify({
             'message': 'Notification created successfully',
@@ -116,28 +252,96 @@ def delete_notification(current_user, notification_id):
     except Exception as e:
         return jsonify({'message': f'Failed to delete notification: {str(e)}'}), 500
 
+BULK_FILTER_KEYS = {'status', 'type', 'scheduled_before', 'created_before'}
+
+def bulk_update_status(user_id, query, status, now=None):
+    """Apply a status change to every row of ``user_id`` matched by ``query`` in one UPDATE; returns the row count."""
+    values = {'status': status}
+    if status == 'sent':
+        values['sent_at'] = now or datetime.utcnow()
+    elif status == 'read':
+        values['read_at'] = now or datetime.utcnow()
+    updated = query.update(values, synchronize_session=False)
+    if updated:
+        bump_data_version([user_id])
+    return updated
+
 @notifications_bp.route('/mark-all-read', methods=['PUT'])
 @token_required
 def mark_all_notifications_read(current_user):
     try:
-        notifications = Notification.query.filter_by(
-            user_id=current_user.id,
-            status='sent'
-        ).all()
-        
-        for notification in notifications:
-            notification.status = 'read'
-            notification.read_at = datetime.utcnow()
+        updated = bulk_update_status(
+            current_user.id,
+            Notification.query.filter_by(user_id=current_user.id, status='sent'),
+            'read'
+        )
         
         db.session.commit()
         
         return jsonify({
-            'message': f'Marked {len(notifications)} notifications as read'
+            'message': f'Marked {updated} notifications as read',
+            'updated': updated
         }), 200
         
     except Exception as e:
         return jsonify({'message': f'Failed to mark all notifications as read: {str(e)}'}), 500
 
+@notifications_bp.route('/bulk', methods=['PUT'])
+@token_required
+def bulk_update_notifications(current_user):
+    try:
+        data = request.json or {}
+        
+        # Validate status
+        valid_statuses = ['pending', 'sent', 'read', 'dismissed']
+        status = data.get('status')
+        if status not in valid_statuses:
+            return jsonify({'message': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'}), 400
+        
+        query = Notification.query.filter_by(user_id=current_user.id)
+        
+        if 'ids' in data:
+            ids = data['ids']
+            if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+                return jsonify({'message': 'ids must be a list of notification ids'}), 400
+            if len(ids) > 10000:
+                return jsonify({'message': 'At most 10000 ids per request'}), 400
+            query = query.filter(Notification.id.in_(ids))
+        elif isinstance(data.get('filter'), dict):
+            criteria = data['filter']
+            # An empty or misspelled filter would otherwise match every notification of the user
+            unknown = set(criteria) - BULK_FILTER_KEYS
+            if unknown:
+                return jsonify({'message': f'Unknown filter keys: {", ".join(sorted(unknown))}'}), 400
+            if not any(criteria.get(key) for key in BULK_FILTER_KEYS):
+                return jsonify({'message': f'filter needs at least one of: {", ".join(sorted(BULK_FILTER_KEYS))}'}), 400
+            if criteria.get('status'):
+                query = query.filter_by(status=criteria['status'])
+            if criteria.get('type'):
+                query = query.filter_by(type=criteria['type'])
+            try:
+                if criteria.get('scheduled_before'):
+                    scheduled_before = datetime.fromisoformat(criteria['scheduled_before'].replace('Z', '+00:00'))
+                    query = query.filter(Notification.scheduled_for <= scheduled_before)
+                if criteria.get('created_before'):
+                    created_before = datetime.fromisoformat(criteria['created_before'].replace('Z', '+00:00'))
+                    query = query.filter(Notification.created_at <= created_before)
+            except (ValueError, AttributeError):
+                return jsonify({'message': 'scheduled_before and created_before must be ISO 8601 datetimes'}), 400
+        else:
+            return jsonify({'message': 'Either ids or filter is required'}), 400
+        
+        updated = bulk_update_status(current_user.id, query, status)
+        db.session.commit()
+        
+        return jsonify({
+            'message': f'Updated {updated} notifications',
+            'updated': updated
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Failed to update notifications: {str(e)}'}), 500
+
 @notifications_bp.route('/reminders', methods=['POST'])
 @token_required
 def create_reminder(current_user):
@@ -159,6 +363,7 @@ def create_reminder(current_user):
         
         db.session.add(reminder)
         db.session.commit()
+        notification_dispatcher.schedule(reminder)
         
         return jsonify({
             'message': 'Reminder created successfully',
@@ -181,39 +386,84 @@ def create_medication_reminder(current_user):
         dosage = data['dosage']
         times = data['times']  # List of time strings like ["08:00", "14:00", "20:00"]
         
-        reminders = []
-        
-        # Create reminders for each time
-        for time_str in times:
-            hour, minute = map(int, time_str.split(':'))
-            
-            # Schedule for today and next 30 days
-            for day_offset in range(31):
-                scheduled_time = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=day_offset)
-                
-                reminder = Notification(
-                    user_id=current_user.id,
-                    type='reminder',
-                    title=f'Medication Reminder: {medication_name}',
-                    message=f'Time to take your {medication_name} ({dosage})',
-                    scheduled_for=scheduled_time,
-                    priority='high',
-                    status='pending'
-                )
-                
-                reminders.append(reminder)
-                db.session.add(reminder)
+        try:
+            time_of_day = [tuple(map(int, time_str.split(':'))) for time_str in times]
+            if not all(len(t) == 2 and 0 <= t[0] < 24 and 0 <= t[1] < 60 for t in time_of_day):
+                raise ValueError
+        except (ValueError, AttributeError):
+            return jsonify({'message': 'Times must be a list of "HH:MM" strings'}), 400
+        
+        # Schedule for today and next 30 days unless an end date is given (local calendar days)
+        start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        if data.get('end_date'):
+            try:
+                if not isinstance(data['end_date'], str):
+                    raise ValueError
+                end_date = datetime.fromisoformat(data['end_date'].replace('Z', '+00:00')).replace(
+                    hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+            except (ValueError, AttributeError):
+                return jsonify({'message': 'end_date must be an ISO 8601 date'}), 400
+        else:
+            end_date = start_date + timedelta(days=30)
+        if end_date < start_date:
+            return jsonify({'message': 'End date must not be in the past'}), 400
+        
+        last_hour, last_minute = max(time_of_day)
+        schedule = MedicationSchedule(
+            user_id=current_user.id,
+            medication_name=medication_name,
+            dosage=dosage,
+            times=json.dumps(times),
+            start_date=start_date,
+            end_date=end_date,
+            ends_at=_local_to_utc(end_date.replace(hour=last_hour, minute=last_minute))
+        )
         
+        db.session.add(schedule)
         db.session.commit()
         
+        reminders_count = len(times) * ((end_date - start_date).days + 1)
+        
         return jsonify({
-            'message': f'Created {len(reminders)} medication reminders for {medication_name}',
-            'reminders_count': len(reminders)
+            'message': f'Created {reminders_count} medication reminders for {medication_name}',
+            'reminders_count': reminders_count,
+            'schedule': schedule.to_dict()
         }), 201
         
     except Exception as e:
         return jsonify({'message': f'Failed to create medication reminders: {str(e)}'}), 500
 
+@notifications_bp.route('/medication-schedules', methods=['GET'])
+@token_required
+def get_medication_schedules(current_user):
+    try:
+        schedules = MedicationSchedule.query.filter_by(user_id=current_user.id).order_by(
+            MedicationSchedule.created_at.desc()
+        ).all()
+        
+        return jsonify([schedule.to_dict() for schedule in schedules]), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Failed to fetch medication schedules: {str(e)}'}), 500
+
+@notifications_bp.route('/medication-schedules/<int:schedule_id>', methods=['DELETE'])
+@token_required
+def cancel_medication_schedule(current_user, schedule_id):
+    try:
+        schedule = MedicationSchedule.query.filter_by(id=schedule_id, user_id=current_user.id).first()
+        
+        if not schedule:
+            return jsonify({'message': 'Medication schedule not found'}), 404
+        
+        # Reminders already delivered stay; future occurrences are never created
+        schedule.status = 'cancelled'
+        db.session.commit()
+        
+        return jsonify({'message': 'Medication schedule cancelled'}), 200
+        
+    except Exception as e:
+        return jsonify({'message': f'Failed to cancel medication schedule: {str(e)}'}), 500
+
 @notifications_bp.route('/motivational', methods=['POST'])
 @token_required
 def send_motivational_message(current_user):
@@ -259,23 +509,51 @@ def get_pending_notifications(current_user):
     try:
         # Get notifications that should be sent now
         current_time = datetime.utcnow()
+        materialize_due_reminders(current_user.id, until=current_time)
         
-        pending_notifications = Notification.query.filter_by(
-            user_id=current_user.id,
-            status='pending'
-        ).filter(
+        # Mark them as sent in one UPDATE; rows the dispatcher sent meanwhile are not returned again
+        pending_notifications = claim_pending_notifications(
+            current_time,
+            Notification.user_id == current_user.id,
             Notification.scheduled_for <= current_time
-        ).order_by(Notification.scheduled_for.asc()).all()
-        
-        # Mark them as sent
-        for notification in pending_notifications:
-            notification.status = 'sent'
-            notification.sent_at = current_time
-        
+        )
+        results = [notification.to_dict() for notification in pending_notifications]
         db.session.commit()
         
-        return jsonify([notification.to_dict() for notification in pending_notifications]), 200
+        return jsonify(results), 200
         
     except Exception as e:
         return jsonify({'message': f'Failed to fetch pending notifications: {str(e)}'}), 500
 
+@notifications_bp.route('/stream', methods=['GET'])
+@token_required
+def stream_notifications(current_user):
+    """Server-Sent Events stream of notifications as the dispatcher sends them."""
+    user_id = current_user.id
+    subscription = notification_dispatcher.subscribe(user_id)
+    # Do not hold a database connection for the lifetime of the stream
+    db.session.close()
+
+    def events():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    payload = subscription.get(timeout=15)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f'event: notification\ndata: {json.dumps(payload)}\n\n'
+        finally:
+            notification_dispatcher.unsubscribe(user_id, subscription)
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@notifications_bp.route('/dispatcher-stats', methods=['GET'])
+@ops_required
+def get_dispatcher_stats():
+    return jsonify(notification_dispatcher.stats), 200
+
@@ -0,0 +1,56 @@
+from flask import jsonify
+from sqlalchemy import and_, or_
+from datetime import datetime
+import base64
+import json
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_value, row_id):
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return the (sort_value, id) position of an opaque cursor; ValueError if it is malformed."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def paginate(query, sort_column, id_column, cursor=None, limit=100):
+    """Return one page of ``query`` newest first, ordered by (sort_column, id), and the next cursor.
+
+    The cursor marks the last row of the previous page, so each page is an
+    index range scan starting just after it rather than an OFFSET that has to
+    skip every earlier row. ``next_cursor`` is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id)
+        ))
+
+    # Fetch one extra row to know whether another page follows
+    rows = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def page_response(items, next_cursor):
+    """Attach the next cursor to a list response as the ``X-Next-Cursor`` header."""
+    response = jsonify(items)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
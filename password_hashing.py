@@ -0,0 +1,184 @@
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+import time
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+def method_prefix(method):
+    """The parameter string werkzeug stores in front of hashes made with ``method``.
+
+    Short forms such as ``scrypt`` or ``pbkdf2:sha256`` are expanded with
+    werkzeug's defaults, without computing a hash.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        if not args:
+            args = [2 ** 15, 8, 1]
+        if len(args) != 3:
+            raise ValueError("'scrypt' takes 3 arguments.")
+        n, r, p = map(int, args)
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2':
+        if len(args) > 2:
+            raise ValueError("'pbkdf2' takes 2 arguments.")
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    raise ValueError(f"Invalid hash method '{method}'.")
+
+
+class PasswordHashingBusy(Exception):
+    """Raised instead of queueing when too many hash operations are already waiting."""
+
+
+def _hash(password, method, salt_length):
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+def _verify(password_hash, password):
+    return check_password_hash(password_hash, password)
+
+
+class PasswordHasher:
+    """Runs password hashing and verification on a dedicated, bounded process pool.
+
+    Hashing is deliberately CPU-expensive, so doing it on request threads lets
+    a burst of logins starve every other endpoint. Work is submitted to
+    ``workers`` processes; once ``queue_limit`` operations are in flight,
+    further calls fail immediately with ``PasswordHashingBusy`` instead of
+    queueing. Calls that wait longer than ``timeout`` seconds fail the same
+    way, but their work keeps its slot until a worker has finished it. With
+    ``workers=0`` hashing runs inline. The pool is started on first use, so
+    importing the app (in a CLI command, a benchmark or a pre-forking
+    server's master process) does not start workers. Workers are started
+    with ``forkserver`` (``spawn`` where unavailable) rather than forked
+    from the threaded server process.
+
+    ``method`` uses werkzeug's format (e.g. ``scrypt:32768:8:1`` or
+    ``pbkdf2:sha256:600000``); ``needs_rehash`` reports hashes made with other
+    parameters so they can be upgraded at the next successful login.
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, salt_length=16, workers=2, queue_limit=16, timeout=10):
+        self.configure(method, salt_length, workers, queue_limit, timeout)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._samples = {'hash': deque(maxlen=1000), 'verify': deque(maxlen=1000)}
+        self._counts = {'hash': 0, 'verify': 0, 'rehash': 0, 'rejected': 0}
+
+    def configure(self, method, salt_length, workers, queue_limit, timeout):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self._method_prefix = None
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get('PASSWORD_HASH_METHOD', self.method),
+            app.config.get('PASSWORD_HASH_SALT_LENGTH', self.salt_length),
+            app.config.get('PASSWORD_HASH_WORKERS', self.workers),
+            app.config.get('PASSWORD_HASH_QUEUE_LIMIT', self.queue_limit),
+            app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout)
+        )
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # The pool starts after the app's threads are running, and forking a threaded
+                    # process can leave a worker blocked on a lock another thread held
+                    methods = multiprocessing.get_all_start_methods()
+                    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._executor
+
+    def _release(self, operation, started):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            self._counts[operation] += 1
+            self._samples[operation].append(elapsed)
+
+    def _reset_executor(self):
+        # A worker died; start a fresh pool for the next call
+        with self._lock:
+            self._executor = None
+
+    def _run(self, operation, fn, *args):
+        with self._lock:
+            if self._in_flight >= self.queue_limit:
+                self._counts['rejected'] += 1
+                raise PasswordHashingBusy('Too many password operations in progress; retry shortly')
+            self._in_flight += 1
+
+        started = time.perf_counter()
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                self._release(operation, started)
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException as e:
+            self._release(operation, started)
+            if isinstance(e, BrokenProcessPool):
+                self._reset_executor()
+            raise
+        # The slot is freed when the work is done, not when this caller stops waiting
+        future.add_done_callback(lambda _: self._release(operation, started))
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()  # frees the slot now if no worker has picked it up yet
+            raise PasswordHashingBusy('Password operation timed out; retry shortly')
+        except BrokenProcessPool:
+            self._reset_executor()
+            raise
+
+    def hash(self, password):
+        return self._run('hash', _hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        return self._run('verify', _verify, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        if self._method_prefix is None:
+            self._method_prefix = method_prefix(self.method)
+        return password_hash.split('$', 1)[0] != self._method_prefix
+
+    def record_rehash(self):
+        with self._lock:
+            self._counts['rehash'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                'method': self.method,
+                'workers': self.workers,
+                'queue_limit': self.queue_limit,
+                'in_flight': self._in_flight,
+                'rehashed': self._counts['rehash'],
+                'rejected': self._counts['rejected']
+            }
+            for operation in ('hash', 'verify'):
+                samples = sorted(self._samples[operation])
+                stats[operation] = {
+                    'count': self._counts[operation],
+                    'p50_ms': round(samples[len(samples) // 2] * 1000, 2) if samples else None,
+                    'p95_ms': round(samples[int(len(samples) * 0.95)] * 1000, 2) if samples else None,
+                    'max_ms': round(samples[-1] * 1000, 2) if samples else None
+                }
+            return stats
+
+
+password_hasher = PasswordHasher()
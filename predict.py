@@ -0,0 +1,196 @@
+from flask import Blueprint, jsonify, request, current_app
+from src.routes.auth import ops_required, token_required
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import threading
+import queue
+import time
+
+from predictor import get_scorer, load_artifact, score_texts
+from prediction_cache import PredictionCache
+
+predict_bp = Blueprint('predict', __name__)
+
+MAX_TEXTS_PER_REQUEST = 1000
+
+
+class MicroBatcher:
+    """Collects concurrent single-text requests into one scoring call.
+
+    A batch is flushed when it reaches ``max_batch_size`` or when the first
+    queued item has waited ``max_wait_ms``, whichever comes first.
+    """
+
+    def __init__(self, score_fn, max_batch_size=32, max_wait_ms=5):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {'batches': 0, 'items': 0, 'max_batch_size_seen': 0}
+
+    def submit(self, text):
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _ensure_started(self):
+        # Also restarts the worker if it died, so queued requests are not left to time out
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='predict-batcher', daemon=True)
+                    self._thread.start()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # Skip requests that gave up (timed out) while queued
+            batch = [(text, future) for text, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            texts = [text for text, _ in batch]
+            try:
+                results = list(self.score_fn(texts))
+                if len(results) != len(batch):
+                    raise RuntimeError(f'Scoring returned {len(results)} results for {len(batch)} texts')
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+            self.stats['batches'] += 1
+            self.stats['items'] += len(batch)
+            self.stats['max_batch_size_seen'] = max(self.stats['max_batch_size_seen'], len(batch))
+
+
+_artifact = None
+_batcher = None
+_cache = None
+_init_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        with _init_lock:
+            if _cache is None:
+                _cache = PredictionCache(
+                    max_entries=current_app.config.get('PREDICTION_CACHE_SIZE', 10000),
+                    ttl_seconds=current_app.config.get('PREDICTION_CACHE_TTL', 3600),
+                    path=current_app.config.get('PREDICTION_CACHE_PATH')
+                )
+    return _cache
+
+
+def get_artifact():
+    global _artifact
+    if _artifact is None:
+        with _init_lock:
+            if _artifact is None:
+                path = current_app.config.get('MODEL_ARTIFACT_PATH')
+                _artifact = load_artifact(path) if path else load_artifact()
+    return _artifact
+
+
+def score_documents(texts):
+    """Score texts in one transform/predict_proba call and return one result dict per text."""
+    artifact = get_artifact()
+    model, vectorizer = get_scorer(artifact)
+    predictions, probabilities = score_texts(
+        model, vectorizer, texts,
+        cache=_cache, model_version=artifact['metadata']['model_version']
+    )
+    classes = [str(c) for c in model.classes_]
+    return [{
+        'prediction': str(prediction),
+        'probabilities': dict(zip(classes, (float(p) for p in row)))
+    } for prediction, row in zip(predictions, probabilities)]
+
+
+def get_batcher():
+    global _batcher
+    if _batcher is None:
+        with _init_lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(
+                    score_documents,
+                    max_batch_size=current_app.config.get('PREDICT_MAX_BATCH_SIZE', 32),
+                    max_wait_ms=current_app.config.get('PREDICT_MAX_WAIT_MS', 5)
+                )
+    return _batcher
+
+
+@predict_bp.route('', methods=['POST'])
+@token_required
+def predict(current_user):
+    # Created inside the request: the batcher thread has no app context
+    try:
+        artifact = get_artifact()
+    except (FileNotFoundError, ValueError) as e:
+        return jsonify({'message': f'Model unavailable: {str(e)}'}), 503
+
+    try:
+        data = request.json or {}
+        get_cache()
+        model_version = artifact['metadata']['model_version']
+
+        # Explicit multi-document requests are already a batch
+        if 'texts' in data:
+            texts = data['texts']
+            if not isinstance(texts, list) or not texts or not all(isinstance(t, str) and t for t in texts):
+                return jsonify({'message': 'texts must be a non-empty list of non-empty strings'}), 400
+            if len(texts) > MAX_TEXTS_PER_REQUEST:
+                return jsonify({'message': f'At most {MAX_TEXTS_PER_REQUEST} texts per request'}), 400
+
+            return jsonify({
+                'model_version': model_version,
+                'predictions': score_documents(texts)
+            }), 200
+
+        text = data.get('text')
+        if not isinstance(text, str) or not text:
+            return jsonify({'message': 'Text is required'}), 400
+
+        future = get_batcher().submit(text)
+        try:
+            result = future.result(timeout=current_app.config.get('PREDICT_TIMEOUT', 10))
+        except FutureTimeoutError:
+            future.cancel()
+            response = jsonify({'message': 'Prediction timed out; retry shortly'})
+            response.headers['Retry-After'] = '1'
+            return response, 503
+        result['model_version'] = model_version
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({'message': f'Prediction failed: {str(e)}'}), 500
+
+
+@predict_bp.route('/stats', methods=['GET'])
+@ops_required
+def get_predict_stats():
+    batcher = get_batcher()
+    stats = dict(batcher.stats)
+    stats['avg_batch_size'] = round(stats['items'] / stats['batches'], 2) if stats['batches'] else 0
+    stats['max_batch_size'] = batcher.max_batch_size
+    stats['max_wait_ms'] = batcher.max_wait * 1000
+    stats['cache'] = get_cache().stats()
+    return jsonify(stats), 200
@@ -0,0 +1,111 @@
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from ttl_cache import TTLCache
+
+
+class PredictionCache(TTLCache):
+    """Bounded LRU cache of prediction results with TTL eviction.
+
+    Keys are a hash of the model version plus the normalized text (the
+    output of ``preprocess_text``), so inputs that only differ in case,
+    punctuation or stop words share an entry. Whenever a different model
+    version is seen the cache is cleared. With a ``path`` the entries are
+    loaded at startup and saved every ``autosave_every`` writes and at exit,
+    so expiry uses wall-clock time.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600, path=None, autosave_every=100):
+        super().__init__(max_entries, ttl_seconds, clock=time.time)
+        self.path = path
+        self.autosave_every = autosave_every
+        self.model_version = None
+        self._save_lock = threading.Lock()
+        self._unsaved = 0
+        self.save_errors = 0
+
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    def bind_model(self, model_version):
+        """Drop every entry if ``model_version`` differs from the cached one."""
+        with self._lock:
+            if model_version != self.model_version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.model_version = model_version
+
+    def _key(self, normalized_text):
+        return hashlib.sha256(f"{self.model_version}\0{normalized_text}".encode('utf-8')).hexdigest()
+
+    def get(self, normalized_text):
+        return super().get(self._key(normalized_text))
+
+    def put(self, normalized_text, value):
+        self.set(self._key(normalized_text), value)
+        with self._lock:
+            self._unsaved += 1
+            should_save = self.path and self._unsaved >= self.autosave_every
+        if should_save:
+            # Persisting is best effort; a failed write must not fail the prediction being cached
+            try:
+                self.save()
+            except Exception:
+                with self._lock:
+                    self.save_errors += 1
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats.update(model_version=self.model_version, save_errors=self.save_errors)
+        return stats
+
+    def save(self):
+        """Atomically write the live entries to ``path``.
+
+        Each write goes to its own temporary file next to ``path``, so saves
+        from other threads or from other processes sharing the file never
+        interleave; the last ``os.replace`` wins.
+        """
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                model_version = self.model_version
+                self._unsaved = 0
+            payload = {
+                'model_version': model_version,
+                'entries': [[key, expires_at, value] for key, expires_at, value in self.items()],
+            }
+            directory, name = os.path.split(os.path.abspath(self.path))
+            f = tempfile.NamedTemporaryFile('w', dir=directory, prefix=f'{name}.', suffix='.tmp', delete=False)
+            tmp_path = f.name
+            try:
+                with f:
+                    json.dump(payload, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self.model_version = payload.get('model_version')
+        self.replace_items(payload.get('entries', []))
@@ -0,0 +1,263 @@
+import os
+import sys
+import time
+
+# Record how long this module takes to import; heavy libraries are loaded lazily
+_module_started = time.perf_counter()
+
+from text_preprocessing import TextPreprocessor
+
+# Bump when the layout of the saved artifact changes
+ARTIFACT_FORMAT_VERSION = 1
+
+DEFAULT_ARTIFACT_PATH = os.environ.get(
+    "MODEL_ARTIFACT_PATH", os.path.join("models", "mental_health_model.joblib")
+)
+
+# Packaged NLTK resources: stopwords_english.txt and nltk_data/corpora/wordnet.
+# They are produced at build time with `python predictor.py --export-resources`
+# so the predictor never has to download anything at runtime.
+DATA_DIR = os.environ.get(
+    "PREDICTOR_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "predictor_data")
+)
+STOPWORDS_PATH = os.path.join(DATA_DIR, "stopwords_english.txt")
+NLTK_DATA_DIR = os.path.join(DATA_DIR, "nltk_data")
+
+# Seconds spent in each startup step, see startup_report()
+STARTUP_TIMINGS = {}
+
+
+def _timed(step, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    STARTUP_TIMINGS[step] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _import_nltk():
+    import nltk
+    # Packaged data first; never fall back to nltk.download()
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    return nltk
+
+
+def load_stop_words():
+    """Stop words from the packaged list, or from a local NLTK install if not packaged."""
+    if os.path.exists(STOPWORDS_PATH):
+        with open(STOPWORDS_PATH, encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    nltk = _timed("import_nltk", _import_nltk)
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        raise LookupError(
+            f"Stop words not found in {DATA_DIR} or the local NLTK data. "
+            "Run `python predictor.py --export-resources` on a build machine."
+        ) from None
+    from nltk.corpus import stopwords
+    return set(stopwords.words('english'))
+
+
+def load_lemmatizer():
+    """WordNet lemmatizer backed by the packaged (or locally installed) WordNet corpus."""
+    nltk = _timed("import_nltk", _import_nltk) if "nltk" not in sys.modules else _import_nltk()
+    try:
+        nltk.data.find('corpora/wordnet')
+    except LookupError:
+        raise LookupError(
+            f"WordNet not found in {NLTK_DATA_DIR} or the local NLTK data. "
+            "Run `python predictor.py --export-resources` on a build machine."
+        ) from None
+    from nltk.stem import WordNetLemmatizer
+    lemmatizer = WordNetLemmatizer()
+    # WordNet itself is loaded on first use; do it here so it is part of startup
+    lemmatizer.lemmatize("warmup")
+    return lemmatizer
+
+
+_preprocessor = None
+
+
+def get_preprocessor():
+    """Shared preprocessing engine (precompiled patterns + memoized lemmas), built on first use."""
+    global _preprocessor
+    if _preprocessor is None:
+        stop_words = _timed("load_stop_words", load_stop_words)
+        lemmatizer = _timed("load_lemmatizer", load_lemmatizer)
+        _preprocessor = TextPreprocessor(stop_words, lemmatizer)
+    return _preprocessor
+
+
+# Function to preprocess text
+def preprocess_text(text):
+    return get_preprocessor()(text)
+
+
+def _preprocess_chunk(texts):
+    return get_preprocessor().batch(texts)
+
+
+def preprocess_batch(texts, workers=0, chunksize=2000):
+    """Normalize a list of documents, optionally across worker processes."""
+    texts = list(texts)
+    if not workers or workers <= 1 or len(texts) <= chunksize:
+        return get_preprocessor().batch(texts)
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [cleaned for chunk in pool.map(_preprocess_chunk, chunks) for cleaned in chunk]
+
+
+def save_artifact(artifact, path=DEFAULT_ARTIFACT_PATH):
+    """Write the artifact atomically so a running app never reads a partial file."""
+    import joblib
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    joblib.dump(artifact, tmp_path, compress=3)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_artifact(path=DEFAULT_ARTIFACT_PATH):
+    """Load a trained artifact written by train_model.py."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Model artifact not found at {path}. Run `python train_model.py` first."
+        )
+    import joblib
+    artifact = joblib.load(path)
+    format_version = artifact.get("format_version")
+    if format_version != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact format {format_version} (expected {ARTIFACT_FORMAT_VERSION}). "
+            "Retrain with the current train_model.py."
+        )
+    return artifact
+
+
+def get_scorer(artifact, engine=None):
+    """Return the (model, vectorizer) pair used by ``score_texts``.
+
+    ``engine`` is "numpy" (NumPy scorer, no sklearn calls at inference),
+    "sklearn", or "auto" (NumPy when the artifact supports it). Defaults to
+    the ``PREDICTOR_ENGINE`` environment variable, then "auto".
+    """
+    engine = engine or os.environ.get("PREDICTOR_ENGINE", "auto")
+    if engine == "sklearn":
+        return artifact['model'], artifact['vectorizer']
+
+    scorer = artifact.get('_numpy_scorer')
+    if scorer is None:
+        from scoring_engine import NumpyScorer
+        try:
+            scorer = NumpyScorer.from_artifact(artifact)
+        except ValueError:
+            if engine == "numpy":
+                raise
+            return artifact['model'], artifact['vectorizer']
+        artifact['_numpy_scorer'] = scorer
+    return scorer, scorer
+
+
+def score_texts(model, vectorizer, texts, cache=None, model_version=None):
+    """Score a list of raw texts as one sparse matrix.
+
+    Returns the predicted labels and the (n_texts, n_classes) probability matrix,
+    with columns in the order of ``model.classes_``. With a ``PredictionCache``,
+    only texts whose normalized form is not cached for ``model_version`` are scored.
+    """
+    import numpy as np
+    cleaned = get_preprocessor().batch(texts)
+    if cache is None:
+        probabilities = model.predict_proba(vectorizer.transform(cleaned))
+    else:
+        cache.bind_model(model_version)
+        probabilities = np.empty((len(cleaned), len(model.classes_)))
+        missing = []
+        for i, text in enumerate(cleaned):
+            cached = cache.get(text)
+            if cached is None:
+                missing.append(i)
+            else:
+                probabilities[i] = cached
+        if missing:
+            scored = model.predict_proba(vectorizer.transform([cleaned[i] for i in missing]))
+            probabilities[missing] = scored
+            for i, row in zip(missing, scored):
+                cache.put(cleaned[i], row.tolist())
+
+    predictions = model.classes_[probabilities.argmax(axis=1)]
+    return predictions, probabilities
+
+
+def export_resources(data_dir=DATA_DIR, download=False):
+    """Copy the stop word list and WordNet from the local NLTK data into ``data_dir``.
+
+    Meant for build machines; ``download=True`` fetches the corpora first.
+    """
+    import shutil
+    import nltk
+
+    if download:
+        nltk.download('stopwords', quiet=True)
+        nltk.download('wordnet', quiet=True)
+
+    from nltk.corpus import stopwords
+    words = sorted(set(stopwords.words('english')))
+    os.makedirs(data_dir, exist_ok=True)
+    with open(os.path.join(data_dir, "stopwords_english.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(words) + "\n")
+
+    target = os.path.join(data_dir, "nltk_data", "corpora")
+    os.makedirs(target, exist_ok=True)
+    for name in ('wordnet.zip', 'wordnet'):
+        try:
+            source = nltk.data.find(f'corpora/{name}')
+        except LookupError:
+            continue
+        source = str(getattr(source, 'path', source))
+        destination = os.path.join(target, os.path.basename(source.rstrip(os.sep)))
+        if os.path.isdir(source):
+            shutil.copytree(source, destination, dirs_exist_ok=True)
+        else:
+            shutil.copy2(source, destination)
+        return data_dir
+    raise LookupError("WordNet is not installed locally; rerun with --download.")
+
+
+def startup_report(artifact_path=DEFAULT_ARTIFACT_PATH):
+    """Time each startup step up to the first prediction."""
+    started = time.perf_counter()
+    artifact = _timed("load_artifact", load_artifact, artifact_path)
+    get_preprocessor()
+    _timed("first_prediction", score_texts, artifact['model'], artifact['vectorizer'], ["warm up"])
+    report = {'import_predictor': _IMPORT_SECONDS}
+    report.update(STARTUP_TIMINGS)
+    report['time_to_first_prediction'] = round(_IMPORT_SECONDS + time.perf_counter() - started, 4)
+    return report
+
+
+_IMPORT_SECONDS = round(time.perf_counter() - _module_started, 4)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Predictor utilities.")
+    parser.add_argument("--export-resources", action="store_true",
+                        help=f"Package stop words and WordNet into {DATA_DIR}")
+    parser.add_argument("--download", action="store_true", help="Download the NLTK corpora before exporting")
+    parser.add_argument("--startup-report", action="store_true", help="Print an import/startup time breakdown")
+    parser.add_argument("--artifact", default=DEFAULT_ARTIFACT_PATH)
+    args = parser.parse_args()
+
+    if args.export_resources:
+        print(f"Exported resources to {export_resources(download=args.download)}")
+    if args.startup_report:
+        print(json.dumps(startup_report(args.artifact), indent=2))
@@ -0,0 +1,296 @@
+import os
+import sys
+# Same import root as main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Relative frequency of each operation in the replayed traffic
+DEFAULT_MIX = {
+    'login': 5,
+    'dashboard': 35,
+    'create_record': 25,
+    'pending': 30,
+    'medication_reminder': 5,
+}
+
+RECORD_TEMPLATES = [
+    ('heart_rate', lambda rng: {'bpm': rng.randint(55, 130)}),
+    ('blood_pressure', lambda rng: {'systolic': rng.randint(100, 160), 'diastolic': rng.randint(60, 100)}),
+    ('weight', lambda rng: {'kg': round(rng.uniform(50, 110), 1)}),
+    ('exercise', lambda rng: {'minutes': rng.randint(10, 90)}),
+    ('sleep', lambda rng: {'hours': round(rng.uniform(4, 10), 1)}),
+    ('water_intake', lambda rng: {'glasses': rng.randint(1, 4)}),
+]
+
+
+class InProcessClient:
+    """Calls the app through Flask's test client: no server needed, one client per thread."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, headers=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=body, headers=headers or {})
+        return response.status_code, response.get_json(silent=True)
+
+
+class HttpClient:
+    """Calls a running server, e.g. ``python main.py`` or gunicorn."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json', **(headers or {})})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+def load_in_process_app(database_url=None):
+    """Import main.py against ``database_url``, or a fresh temporary SQLite file.
+
+    The notification dispatcher is disabled so due notifications are delivered
+    by the ``pending`` polls being measured rather than by a background thread.
+    """
+    os.environ['NOTIFICATION_DISPATCHER'] = '0'
+    if database_url:
+        os.environ['DATABASE_URL'] = database_url
+    else:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='load_test_'), 'load_test.db')}"
+    from src.main import app
+    return app
+
+
+def _check_seed(what, status, body, expected=201):
+    if status != expected:
+        raise RuntimeError(f'Failed to seed {what}: HTTP {status} {body}')
+
+
+def seed(client, users, records_per_user, goals_per_user, notifications_per_user, seed_value=0):
+    """Create synthetic users through the API and return their credentials and tokens.
+
+    Any failed request aborts the run, so results are never reported against a partly seeded dataset.
+    """
+    rng = random.Random(seed_value)
+    run_id = f'{int(time.time())}{rng.randint(1000, 9999)}'
+    now = datetime.utcnow()
+    accounts = []
+
+    for i in range(users):
+        username = f'load_{run_id}_{i}'
+        status, body = client.request('POST', '/api/auth/register', {
+            'username': username, 'email': f'{username}@example.com', 'password': 'load-test',
+            'age': rng.randint(18, 80), 'height': rng.randint(150, 195), 'weight': rng.randint(50, 110)
+        })
+        _check_seed(f'user {username}', status, body)
+        headers = {'Authorization': f"Bearer {body['token']}"}
+        accounts.append({'username': username, 'password': 'load-test', 'headers': headers})
+
+        records = []
+        for j in range(records_per_user):
+            record_type, make_value = rng.choice(RECORD_TEMPLATES)
+            records.append({
+                'record_type': record_type,
+                'value': make_value(rng),
+                'recorded_at': (now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))).isoformat(),
+                'idempotency_key': f'seed-{i}-{j}'
+            })
+        for start in range(0, len(records), 5000):
+            batch = records[start:start + 5000]
+            status, body = client.request('POST', '/api/health/records/batch', batch, headers)
+            _check_seed(f'health records for {username}', status, body, expected=200)
+            if body['created'] + body['duplicates'] != len(batch):
+                raise RuntimeError(f"Failed to seed health records for {username}: {body['invalid']} invalid")
+
+        for j in range(goals_per_user):
+            status, body = client.request('POST', '/api/goals', {
+                'goal_type': rng.choice(['exercise', 'water_intake', 'sleep', 'weight_loss']),
+                'title': f'Goal {j}', 'target_value': rng.randint(5, 200)
+            }, headers)
+            _check_seed(f'goal for {username}', status, body)
+
+        for j in range(notifications_per_user):
+            status, body = client.request('POST', '/api/notifications', {
+                'type': rng.choice(['reminder', 'alert', 'motivation']),
+                'title': f'Notification {j}', 'message': 'Synthetic load-test notification',
+                'scheduled_for': (now + timedelta(minutes=rng.randint(-600, 600))).isoformat()
+            }, headers)
+            _check_seed(f'notification for {username}', status, body)
+
+    return accounts
+
+
+def run_operation(client, name, account, rng):
+    headers = account['headers']
+    if name == 'login':
+        return client.request('POST', '/api/auth/login', {'username': account['username'], 'password': account['password']})
+    if name == 'dashboard':
+        return client.request('GET', '/api/dashboard', headers=headers)
+    if name == 'create_record':
+        record_type, make_value = rng.choice(RECORD_TEMPLATES)
+        return client.request('POST', '/api/health/records', {'record_type': record_type, 'value': make_value(rng)}, headers)
+    if name == 'pending':
+        return client.request('GET', '/api/notifications/pending', headers=headers)
+    if name == 'medication_reminder':
+        return client.request('POST', '/api/notifications/medication-reminders', {
+            'medication_name': rng.choice(['Metformin', 'Lisinopril', 'Sertraline']),
+            'dosage': '10mg', 'times': ['08:00', '20:00'],
+            'end_date': (datetime.now() + timedelta(days=7)).date().isoformat()
+        }, headers)
+    raise ValueError(f'Unknown operation {name}')
+
+
+def run_level(client, accounts, concurrency, duration, mix, seed_value=0):
+    """Run ``concurrency`` virtual users for ``duration`` seconds and summarize per operation."""
+    names, weights = zip(*mix.items())
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    items = {name: 0 for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def virtual_user(index):
+        rng = random.Random(seed_value * 1000 + index)
+        local_samples = {name: [] for name in names}
+        local_errors = {name: 0 for name in names}
+        local_items = {name: 0 for name in names}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                status, body = run_operation(client, name, rng.choice(accounts), rng)
+            except Exception:
+                status, body = None, None
+            local_samples[name].append(time.perf_counter() - started)
+            if isinstance(body, list):
+                local_items[name] += len(body)
+            if status is None or status >= 400:
+                local_errors[name] += 1
+        with lock:
+            for name in names:
+                samples[name].extend(local_samples[name])
+                errors[name] += local_errors[name]
+                items[name] += local_items[name]
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=virtual_user, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    endpoints = {}
+    for name in names:
+        latencies = np.asarray(samples[name])
+        endpoints[name] = {
+            'requests': len(latencies),
+            'errors': errors[name],
+            'error_rate': round(errors[name] / len(latencies), 4) if len(latencies) else 0.0,
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 2) if len(latencies) else None,
+            'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 2) if len(latencies) else None,
+            'p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 2) if len(latencies) else None,
+        }
+        if name == 'pending':
+            # Most polls return nothing once the seeded due notifications are claimed
+            endpoints[name]['notifications_returned'] = items[name]
+
+    total = sum(endpoint['requests'] for endpoint in endpoints.values())
+    total_errors = sum(endpoint['errors'] for endpoint in endpoints.values())
+    return {
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 2),
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 1),
+        'error_rate': round(total_errors / total, 4) if total else 0.0,
+        'endpoints': endpoints,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.realpath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed synthetic data and replay a realistic API traffic mix at increasing concurrency.")
+    parser.add_argument("--base-url", default=None, help="Load a running server instead of the app in-process")
+    parser.add_argument("--database-url", default=None,
+                        help="In-process only: database to use (default: a temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--records-per-user", type=int, default=500)
+    parser.add_argument("--goals-per-user", type=int, default=3)
+    parser.add_argument("--notifications-per-user", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per concurrency level")
+    parser.add_argument("--mix", default=None, help='JSON weights, e.g. \'{"dashboard": 50, "pending": 50}\'')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load_test_results.json")
+    args = parser.parse_args()
+
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        mix = {name: weight for name, weight in json.loads(args.mix).items() if weight > 0}
+        unknown = set(mix) - set(DEFAULT_MIX)
+        if unknown:
+            parser.error(f"Unknown operations in --mix: {', '.join(sorted(unknown))}")
+
+    client = HttpClient(args.base_url) if args.base_url else InProcessClient(load_in_process_app(args.database_url))
+
+    started = time.perf_counter()
+    accounts = seed(client, args.users, args.records_per_user, args.goals_per_user,
+                    args.notifications_per_user, args.seed)
+    print(f"Seeded {len(accounts)} users in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    levels = []
+    for concurrency in args.concurrency:
+        result = run_level(client, accounts, concurrency, args.duration, mix, args.seed)
+        levels.append(result)
+        print(f"concurrency {concurrency}: {result['throughput_rps']} req/s, "
+              f"error rate {result['error_rate']:.2%}", file=sys.stderr)
+
+    report = {
+        'created_at': datetime.utcnow().isoformat(),
+        'git_revision': _git_revision(),
+        'target': args.base_url or 'in-process',
+        'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+        'config': {
+            'users': args.users, 'records_per_user': args.records_per_user,
+            'goals_per_user': args.goals_per_user, 'notifications_per_user': args.notifications_per_user,
+            'duration': args.duration, 'mix': mix, 'seed': args.seed,
+        },
+        'levels': levels,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import re
+
+import numpy as np
+
+
+class NumpyScorer:
+    """Scores preprocessed documents with plain NumPy instead of sklearn.
+
+    A TF-IDF + linear model is a sparse dot product followed by a
+    sigmoid/softmax, so the fitted vocabulary, idf weights, ``coef_`` and
+    ``intercept_`` are all that is needed. The scorer mirrors the small part
+    of the sklearn API used by ``predictor.score_texts``: it acts as both the
+    vectorizer (``transform``) and the model (``predict_proba``, ``classes_``).
+    """
+
+    def __init__(self, vocabulary, idf, coef, intercept, classes, token_pattern=r"(?u)\b\w\w+\b",
+                 lowercase=True, sublinear_tf=False, norm='l2', proba='ovr', model_version=None):
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.coef_t = np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T)  # (n_features, n_rows)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.token_pattern = token_pattern
+        self._tokenize = re.compile(token_pattern).findall
+        self.lowercase = lowercase
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.proba = proba
+        self.model_version = model_version
+
+    @classmethod
+    def from_artifact(cls, artifact):
+        """Export a fitted TfidfVectorizer + linear classifier; ValueError if unsupported."""
+        vectorizer, model = artifact['vectorizer'], artifact['model']
+
+        vocabulary = getattr(vectorizer, 'vocabulary_', None)
+        if vocabulary is None:
+            raise ValueError("Only TF-IDF vocabulary artifacts can be exported (hashing models are not supported)")
+        unsupported = (
+            vectorizer.analyzer != 'word' or tuple(vectorizer.ngram_range) != (1, 1)
+            or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None
+            or vectorizer.stop_words is not None or vectorizer.strip_accents is not None
+            or vectorizer.binary or vectorizer.norm not in ('l1', 'l2', None)
+        )
+        if unsupported:
+            raise ValueError("TfidfVectorizer settings are not supported by the NumPy scorer")
+        if not hasattr(model, 'coef_') or not hasattr(model, 'intercept_'):
+            raise ValueError(f"{type(model).__name__} is not a linear model")
+
+        idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(len(vocabulary))
+        return cls(
+            vocabulary=dict(vocabulary),
+            idf=idf,
+            coef=model.coef_,
+            intercept=model.intercept_,
+            classes=model.classes_,
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase,
+            sublinear_tf=vectorizer.sublinear_tf,
+            norm=vectorizer.norm,
+            proba=_proba_mode(model),
+            model_version=artifact.get('metadata', {}).get('model_version'),
+        )
+
+    def save(self, path):
+        terms = np.empty(len(self.vocabulary), dtype=object)
+        for term, index in self.vocabulary.items():
+            terms[index] = term
+        np.savez_compressed(
+            path,
+            terms=terms.astype(str),
+            idf=self.idf,
+            coef=self.coef_t.T,
+            intercept=self.intercept,
+            classes=self.classes_.astype(str),
+            config=np.array([self.token_pattern, str(self.lowercase), str(self.sublinear_tf),
+                             str(self.norm), self.proba, str(self.model_version)]),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            token_pattern, lowercase, sublinear_tf, norm, proba, model_version = data['config'].tolist()
+            return cls(
+                vocabulary={term: i for i, term in enumerate(data['terms'].tolist())},
+                idf=data['idf'],
+                coef=data['coef'],
+                intercept=data['intercept'],
+                classes=data['classes'],
+                token_pattern=token_pattern,
+                lowercase=lowercase == 'True',
+                sublinear_tf=sublinear_tf == 'True',
+                norm=None if norm == 'None' else norm,
+                proba=proba,
+                model_version=None if model_version == 'None' else model_version,
+            )
+
+    def transform(self, docs):
+        """Return TF-IDF features as (row, column, weight) arrays sorted by row."""
+        vocabulary = self.vocabulary
+        rows, cols = [], []
+        for i, doc in enumerate(docs):
+            if self.lowercase:
+                doc = doc.lower()
+            ids = [vocabulary[token] for token in self._tokenize(doc) if token in vocabulary]
+            cols.extend(ids)
+            rows.extend([i] * len(ids))
+
+        n_features = len(self.idf)
+        keys = np.asarray(rows, dtype=np.int64) * n_features + np.asarray(cols, dtype=np.int64)
+        keys, counts = np.unique(keys, return_counts=True)
+        row, col = keys // n_features, keys % n_features
+
+        tf = counts.astype(np.float64)
+        if self.sublinear_tf:
+            tf = np.log(tf) + 1
+        weight = tf * self.idf[col]
+
+        if self.norm is not None and len(weight):
+            if self.norm == 'l2':
+                norms = np.sqrt(np.bincount(row, weight * weight, minlength=len(docs)))
+            else:
+                norms = np.bincount(row, np.abs(weight), minlength=len(docs))
+            weight /= norms[row]
+        return len(docs), row, col, weight
+
+    def decision_function(self, features):
+        n_docs, row, col, weight = features
+        scores = np.tile(self.intercept, (n_docs, 1))
+        if len(weight):
+            contributions = weight[:, None] * self.coef_t[col]
+            starts = np.flatnonzero(np.r_[True, row[1:] != row[:-1]])
+            scores[row[starts]] += np.add.reduceat(contributions, starts, axis=0)
+        return scores
+
+    def predict_proba(self, features):
+        scores = self.decision_function(features)
+        if self.proba == 'multinomial':
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+            return scores / scores.sum(axis=1, keepdims=True)
+
+        # One-vs-rest, normalized like sklearn's _predict_proba_lr
+        probabilities = 1.0 / (1.0 + np.exp(-scores))
+        if probabilities.shape[1] == 1:
+            return np.hstack([1 - probabilities, probabilities])
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def predict(self, features):
+        return self.classes_[self.predict_proba(features).argmax(axis=1)]
+
+
+def _proba_mode(model):
+    if type(model).__name__ == 'SGDClassifier':
+        if model.loss not in ('log_loss', 'log'):
+            raise ValueError("Only log-loss SGD models have probabilities")
+        return 'ovr'
+    if len(model.classes_) == 2:
+        return 'ovr'
+    multi_class = getattr(model, 'multi_class', 'auto')
+    if multi_class == 'ovr' or getattr(model, 'solver', None) == 'liblinear':
+        return 'ovr'
+    return 'multinomial'
+
+
+def verify(artifact, texts, atol=1e-6):
+    """Largest absolute probability difference between the NumPy scorer and sklearn."""
+    from predictor import preprocess_batch
+    scorer = NumpyScorer.from_artifact(artifact)
+    cleaned = preprocess_batch(texts)
+    expected = artifact['model'].predict_proba(artifact['vectorizer'].transform(cleaned))
+    actual = scorer.predict_proba(scorer.transform(cleaned))
+    max_diff = float(np.abs(expected - actual).max()) if len(texts) else 0.0
+    return max_diff, max_diff <= atol
+
+
+def main():
+    import argparse
+    import pandas as pd
+    from predictor import DEFAULT_ARTIFACT_PATH, load_artifact
+
+    parser = argparse.ArgumentParser(description="Export the model to NumPy arrays and check it against sklearn.")
+    parser.add_argument("--artifact", default=DEFAULT_ARTIFACT_PATH)
+    parser.add_argument("--output", default=None, help="Write the compact .npz scorer here")
+    parser.add_argument("--verify", default=None, help="CSV with texts to compare against sklearn")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--limit", type=int, default=5000)
+    parser.add_argument("--atol", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    artifact = load_artifact(args.artifact)
+    if args.output:
+        NumpyScorer.from_artifact(artifact).save(args.output)
+        print(f"Saved NumPy scorer to {args.output}")
+
+    if args.verify:
+        texts = pd.read_csv(args.verify, usecols=[args.text_column], nrows=args.limit)[args.text_column]
+        max_diff, ok = verify(artifact, texts.fillna('').astype(str).tolist(), args.atol)
+        print(f"max |p_numpy - p_sklearn| = {max_diff:.3e} ({'OK' if ok else 'MISMATCH'})")
+        raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from flask import current_app, make_response, request
+from flask.json.provider import DefaultJSONProvider
+from src.models.user import Goal, HealthRecord, Notification, User, db
+from datetime import datetime
+from functools import wraps
+from sqlalchemy import event, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import hashlib
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the standard library encoder
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson when it is installed.
+
+    Output matches the default provider (sorted keys, same handling of dates
+    and other non-JSON types via ``default``); pretty-printed debug responses
+    and calls with extra ``dumps`` options still go through ``json``.
+    """
+
+    options = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self.options).decode()
+
+    def response(self, *args, **kwargs):
+        if orjson is None or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.options)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+class UserDataVersion(db.Model):
+    """Counter bumped whenever any of a user's data changes; ETags of read endpoints are derived from it."""
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Changes to these models are picked up automatically on flush
+VERSIONED_MODELS = (User, HealthRecord, Goal, Notification)
+
+
+def bump_data_version(user_ids, connection=None):
+    """Invalidate the ETags of the given users; call after bulk statements that bypass the ORM flush."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    connection = connection or db.session.connection()
+    now = datetime.utcnow()
+
+    updated = connection.execute(
+        update(UserDataVersion).where(UserDataVersion.user_id.in_(user_ids))
+        .values(version=UserDataVersion.version + 1, updated_at=now)
+    ).rowcount
+    if updated == len(user_ids):
+        return
+
+    existing = {row[0] for row in connection.execute(
+        UserDataVersion.__table__.select().with_only_columns(UserDataVersion.user_id)
+        .where(UserDataVersion.user_id.in_(user_ids))
+    )}
+    for user_id in user_ids - existing:
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(UserDataVersion).values(user_id=user_id, version=1, updated_at=now))
+        except IntegrityError:
+            # Created concurrently; bump that row instead
+            connection.execute(
+                update(UserDataVersion).where(UserDataVersion.user_id == user_id)
+                .values(version=UserDataVersion.version + 1, updated_at=now)
+            )
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_versions_after_flush(session, flush_context):
+    user_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            user_ids.add(obj.id)
+        elif isinstance(obj, VERSIONED_MODELS):
+            user_ids.add(obj.user_id)
+    # A deleted user's version row is deleted with it
+    user_ids -= {obj.id for obj in session.deleted if isinstance(obj, User)}
+    if user_ids:
+        bump_data_version(user_ids, session.connection())
+
+
+def get_data_version(user_id):
+    version = db.session.query(UserDataVersion.version).filter_by(user_id=user_id).scalar()
+    return version or 0
+
+
+def data_etag(user):
+    """Strong ETag for the current request: user, data version, UTC hour and the full path with query string.
+
+    The hour is included because some responses (e.g. 7-day counts in the
+    health summary) change as time passes without any write. The user's
+    creation time is included because SQLite can give a deleted user's id
+    to the next account, whose versions start again from 1.
+    """
+    key = (f'{user.id}:{user.created_at}:{get_data_version(user.id)}:'
+           f'{datetime.utcnow():%Y-%m-%dT%H}:{request.full_path}')
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def etag_by_data_version(prepare=None):
+    """Answer ``If-None-Match`` with 304 when the user's data has not changed; use below ``token_required``.
+
+    ``prepare(current_user)`` runs before the ETag is computed, for routes
+    that write derived data on read (e.g. due medication reminders).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(current_user, *args, **kwargs):
+            if prepare:
+                prepare(current_user)
+            etag = data_etag(current_user)
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(current_user, *args, **kwargs))
+                if response.status_code != 200 or response.headers.get('Cache-Control') == 'no-store':
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated
+    return decorator
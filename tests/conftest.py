@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import types
+import uuid
+import zipfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_ARCHIVE = os.path.join(ROOT, 'health_bot_backend_src.zip')
+MODELS_MEMBER = 'health_bot_backend/src/models/user.py'
+
+# Modules import each other by their flat names (e.g. ``from text_preprocessing import ...``)
+sys.path.insert(0, ROOT)
+
+
+def _package(name, path):
+    package = types.ModuleType(name)
+    package.__path__ = [path]
+    sys.modules[name] = package
+    return package
+
+
+def _install_src_packages():
+    """Map the deployed layout onto this tree: src/main.py and src/routes/* are the root
+    modules, and src/models/user.py is the model module shipped in the backend archive."""
+    models_dir = tempfile.mkdtemp(prefix='health_bot_models_')
+    with zipfile.ZipFile(MODELS_ARCHIVE) as archive, open(os.path.join(models_dir, 'user.py'), 'wb') as f:
+        f.write(archive.read(MODELS_MEMBER))
+
+    src = _package('src', ROOT)
+    src.routes = _package('src.routes', ROOT)
+    src.models = _package('src.models', models_dir)
+
+
+_install_src_packages()
+
+
+@pytest.fixture(scope='session')
+def app():
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='health_bot_test_'), 'test.db')}"
+    os.environ['NOTIFICATION_DISPATCHER'] = '0'
+    os.environ['PASSWORD_HASH_WORKERS'] = '0'
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+
+    from src.main import app
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a fresh user and return its Authorization header."""
+    username = f'user_{uuid.uuid4().hex[:12]}'
+    response = client.post('/api/auth/register', json={
+        'username': username, 'email': f'{username}@example.com', 'password': 'password',
+        'height': 175, 'weight': 70
+    })
+    assert response.status_code == 201, response.get_json()
+    return {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+@pytest.fixture
+def statements(app):
+    """SQL statements executed while the test runs."""
+    from src.models.user import db
+    from sqlalchemy import event
+
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
@@ -0,0 +1,21 @@
+def _create_notification(client, headers):
+    response = client.post('/api/notifications', headers=headers, json={
+        'type': 'motivation', 'title': 'Keep going', 'message': 'You are doing great'
+    })
+    assert response.status_code == 201
+
+
+def test_bulk_filter_requires_a_known_criterion(client, auth_headers):
+    _create_notification(client, auth_headers)
+
+    for criteria in ({}, {'status': ''}, {'stauts': 'pending'}, {'status': 'pending', 'user_id': 1}):
+        response = client.put('/api/notifications/bulk', headers=auth_headers,
+                              json={'status': 'dismissed', 'filter': criteria})
+        assert response.status_code == 400, criteria
+
+    notifications = client.get('/api/notifications', headers=auth_headers).get_json()
+    assert [n['status'] for n in notifications] == ['pending']
+
+    response = client.put('/api/notifications/bulk', headers=auth_headers,
+                          json={'status': 'dismissed', 'filter': {'status': 'pending'}})
+    assert response.get_json()['updated'] == 1
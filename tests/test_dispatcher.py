@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from src.routes.dispatcher import NotificationDispatcher
+
+
+def _create_due_notification(client, headers):
+    response = client.post('/api/notifications', headers=headers, json={
+        'type': 'alert', 'title': 'Check in', 'message': 'Time to log your mood',
+        'scheduled_for': (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+    })
+    assert response.status_code == 201
+    return response.get_json()['notification']
+
+
+def _dispatcher(app):
+    dispatcher = NotificationDispatcher()
+    dispatcher.app = app
+    return dispatcher
+
+
+def test_due_notification_without_stream_is_left_for_pending(app, client, auth_headers):
+    notification = _create_due_notification(client, auth_headers)
+    dispatcher = _dispatcher(app)
+
+    dispatcher.run_pending()
+
+    assert dispatcher.stats['dispatched'] == 0
+    pending = client.get('/api/notifications/pending', headers=auth_headers).get_json()
+    assert [item['id'] for item in pending] == [notification['id']]
+
+
+def test_due_notification_is_pushed_to_local_stream(app, client, auth_headers):
+    notification = _create_due_notification(client, auth_headers)
+    dispatcher = _dispatcher(app)
+    subscription = dispatcher.subscribe(notification['user_id'])
+
+    dispatcher.run_pending()
+
+    assert subscription.get_nowait()['id'] == notification['id']
+    assert client.get('/api/notifications/pending', headers=auth_headers).get_json() == []
+
+
+def test_dead_or_inherited_thread_is_restarted_on_subscribe(app, monkeypatch):
+    dispatcher = NotificationDispatcher()
+    monkeypatch.setattr(dispatcher, '_run', lambda: None)
+    dispatcher.init_app(app)
+    dispatcher._thread.join()
+
+    dispatcher.subscribe(1)
+    assert dispatcher.stats['restarts'] == 1
+
+    # Same as after a fork: the recorded thread belongs to another process
+    dispatcher._pid = -1
+    dispatcher.subscribe(1)
+    assert dispatcher._pid != -1
+    assert dispatcher._subscribed_users() == [1]
+
+
+def test_subscribe_during_refill_keeps_the_refill_request(app):
+    dispatcher = _dispatcher(app)
+    subscribed_users = dispatcher._subscribed_users
+
+    def subscribe_mid_refill():
+        dispatcher._subscribed_users = subscribed_users
+        dispatcher.subscribe(1)
+        return subscribed_users()
+
+    dispatcher._subscribed_users = subscribe_mid_refill
+    dispatcher.run_pending()
+
+    assert dispatcher._next_refill == datetime.min
@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+from src.routes.health import RECORD_TYPES
+
+
+def _create_records(client, headers):
+    now = datetime.utcnow()
+    for i, record_type in enumerate(RECORD_TYPES):
+        for days_ago in (1, 3, 20):
+            response = client.post('/api/health/records', headers=headers, json={
+                'record_type': record_type,
+                'value': {'value': 60 + i},
+                'recorded_at': (now - timedelta(days=days_ago, minutes=i)).isoformat()
+            })
+            assert response.status_code == 201
+
+
+def test_summary_query_count_does_not_grow_with_record_types(client, auth_headers, statements):
+    _create_records(client, auth_headers)
+    client.get('/api/health/summary', headers=auth_headers)  # warm the user cache
+
+    statements.clear()
+    response = client.get('/api/health/summary', headers=auth_headers)
+
+    assert response.status_code == 200
+    summary = response.get_json()
+    assert summary['total_records'] == 3 * len(RECORD_TYPES)
+    assert all(entry['count_last_7_days'] == 2 for entry in summary['health_records_summary'].values())
+    # Data version for the ETag, then the windowed summary query
+    assert len(statements) == 2, statements
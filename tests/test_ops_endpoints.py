@@ -0,0 +1,23 @@
+import pytest
+
+OPS_ENDPOINTS = ['/api/auth/cache-stats', '/api/auth/hashing-stats', '/api/notifications/dispatcher-stats',
+                 '/api/predict/stats']
+
+
+@pytest.fixture
+def ops_token(app):
+    app.config['OPS_TOKEN'] = 'ops-secret'
+    yield 'ops-secret'
+    app.config['OPS_TOKEN'] = None
+
+
+@pytest.mark.parametrize('path', OPS_ENDPOINTS)
+def test_ops_endpoints_are_hidden_without_a_configured_token(client, auth_headers, path):
+    assert client.get(path, headers=auth_headers).status_code == 404
+
+
+@pytest.mark.parametrize('path', OPS_ENDPOINTS)
+def test_ops_endpoints_require_the_ops_token(client, auth_headers, ops_token, path):
+    assert client.get(path, headers=auth_headers).status_code == 403
+    assert client.get(path, headers={'X-Ops-Token': 'wrong'}).status_code == 403
+    assert client.get(path, headers={'X-Ops-Token': ops_token}).status_code == 200
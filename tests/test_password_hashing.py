@@ -0,0 +1,17 @@
+import pytest
+
+from src.routes import password_hashing
+from src.routes.password_hashing import PasswordHasher, method_prefix
+
+
+@pytest.mark.parametrize('method', ['scrypt', 'scrypt:16384:8:1', 'pbkdf2:sha512:1000', 'pbkdf2:sha256:1000'])
+def test_method_prefix_matches_werkzeug(method):
+    assert method_prefix(method) == password_hashing._hash('', method, 1).split('$', 1)[0]
+
+
+def test_needs_rehash_does_not_hash(monkeypatch):
+    hasher = PasswordHasher(method='scrypt', workers=0)
+    monkeypatch.setattr(password_hashing, '_hash', pytest.fail)
+
+    assert not hasher.needs_rehash('scrypt:32768:8:1$salt$digest')
+    assert hasher.needs_rehash('pbkdf2:sha256:600000$salt$digest')
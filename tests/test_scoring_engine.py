@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from scoring_engine import NumpyScorer
+
+WORDS = {
+    'anxiety': ['worried', 'nervous', 'panic', 'racing', 'heart', 'restless'],
+    'depression': ['sad', 'empty', 'hopeless', 'tired', 'alone', 'numb'],
+    'normal': ['happy', 'calm', 'rested', 'friends', 'walk', 'good'],
+}
+SHARED = ['today', 'feel', 'really', 'week', 'sleep', 'work']
+
+
+def _corpus(labels, n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    texts, y = [], []
+    for i in range(n):
+        label = labels[i % len(labels)]
+        words = list(rng.choice(WORDS[label], 4)) + list(rng.choice(SHARED, 3))
+        texts.append(' '.join(rng.permutation(words)))
+        y.append(label)
+    return texts, y
+
+
+def _artifact(model, labels, **vectorizer_options):
+    texts, y = _corpus(labels)
+    vectorizer = TfidfVectorizer(**vectorizer_options)
+    model.fit(vectorizer.fit_transform(texts), y)
+    return {'vectorizer': vectorizer, 'model': model, 'metadata': {'model_version': 'test'}}
+
+
+@pytest.mark.parametrize('labels, model, proba, vectorizer_options', [
+    (['anxiety', 'depression', 'normal'], LogisticRegression(max_iter=1000), 'multinomial', {}),
+    (['anxiety', 'normal'], LogisticRegression(solver='liblinear'), 'ovr', {'sublinear_tf': True}),
+    (['anxiety', 'depression', 'normal'], SGDClassifier(loss='log_loss', random_state=0), 'ovr', {'norm': 'l1'}),
+    (['depression', 'normal'], LogisticRegression(max_iter=1000), 'ovr', {}),
+])
+def test_numpy_scorer_matches_sklearn(labels, model, proba, vectorizer_options):
+    artifact = _artifact(model, labels, **vectorizer_options)
+    scorer = NumpyScorer.from_artifact(artifact)
+    texts, _ = _corpus(labels, n=30, seed=1)
+    texts += ['', 'unknown words only', 'Sad SAD sad but calm']
+
+    features = artifact['vectorizer'].transform(texts)
+    assert scorer.proba == proba
+    assert np.allclose(scorer.predict_proba(scorer.transform(texts)), artifact['model'].predict_proba(features))
+    assert list(scorer.predict(scorer.transform(texts))) == list(artifact['model'].predict(features))
+
+
+def test_numpy_scorer_round_trips_through_npz(tmp_path):
+    artifact = _artifact(LogisticRegression(max_iter=1000), ['anxiety', 'depression', 'normal'])
+    texts, _ = _corpus(['anxiety', 'depression', 'normal'], n=10, seed=2)
+    path = tmp_path / 'scorer.npz'
+    NumpyScorer.from_artifact(artifact).save(path)
+
+    scorer = NumpyScorer.load(path)
+    expected = artifact['model'].predict_proba(artifact['vectorizer'].transform(texts))
+    assert np.allclose(scorer.predict_proba(scorer.transform(texts)), expected)
+
+
+def test_from_artifact_rejects_hashing_artifacts():
+    texts, y = _corpus(['anxiety', 'normal'])
+    vectorizer = HashingVectorizer(n_features=2 ** 10)
+    model = SGDClassifier(loss='log_loss').fit(vectorizer.transform(texts), y)
+
+    with pytest.raises(ValueError, match='hashing'):
+        NumpyScorer.from_artifact({'vectorizer': vectorizer, 'model': model, 'metadata': {}})
@@ -0,0 +1,67 @@
+import pytest
+
+from text_preprocessing import TextPreprocessor, check_parity, legacy_preprocess_text
+
+STOP_WORDS = {'the', 'a', 'and', 'i', 'am', 'is', 'to', 'of', 'my', 'not'}
+
+
+class StubLemmatizer:
+    """Offline stand-in for WordNetLemmatizer that records every lookup."""
+
+    LEMMAS = {'feeling': 'feel', 'days': 'day', 'thoughts': 'thought', 'feet': 'foot', 'running': 'run'}
+
+    def __init__(self):
+        self.calls = []
+
+    def lemmatize(self, word):
+        self.calls.append(word)
+        return self.LEMMAS.get(word, word)
+
+
+TEXTS = [
+    '',
+    '   ',
+    'I am feeling SO tired, and... anxious!!!',
+    "Can't sleep: 3 nights in a row (since 12/05)",
+    '2024 was 100% the worst year',
+    'the and a of to is',
+    'running running running, feet feet; days days days',
+    'Tabs\tand\nnewlines\r\nbetween   words',
+    'café naïve über',
+    'my thoughts are not my own',
+]
+
+
+@pytest.fixture
+def engine():
+    lemmatizer = StubLemmatizer()
+    return TextPreprocessor(STOP_WORDS, lemmatizer), lemmatizer
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_matches_legacy_implementation(engine, text):
+    preprocessor, lemmatizer = engine
+    assert preprocessor(text) == legacy_preprocess_text(text, STOP_WORDS, lemmatizer)
+
+
+def test_batch_matches_single_calls(engine):
+    preprocessor, lemmatizer = engine
+    expected = [legacy_preprocess_text(text, STOP_WORDS, lemmatizer) for text in TEXTS]
+    assert preprocessor.batch(TEXTS) == expected
+    assert check_parity(preprocessor, TEXTS, STOP_WORDS, lemmatizer) == []
+
+
+def test_repeated_words_are_lemmatized_once(engine):
+    preprocessor, lemmatizer = engine
+    assert preprocessor('running running running, feet feet; the the') == 'run run run foot foot'
+    assert sorted(lemmatizer.calls) == ['feet', 'running']
+
+    preprocessor.clear_cache()
+    preprocessor('running')
+    assert lemmatizer.calls.count('running') == 2
+
+
+def test_check_parity_reports_mismatches(engine):
+    preprocessor, lemmatizer = engine
+    other = TextPreprocessor(STOP_WORDS - {'the'}, lemmatizer)
+    assert check_parity(other, ['the days'], STOP_WORDS, lemmatizer) == [('the days', 'day', 'the day')]
@@ -0,0 +1,39 @@
+from prediction_cache import PredictionCache
+from ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_and_least_recently_used_is_evicted():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl_seconds=60)  # cannot outlive the cache TTL
+    assert cache.get('a') == 1
+    cache.set('c', 3)  # evicts 'b', the least recently used
+
+    assert cache.get('b') is None
+    clock.now += 10
+    assert cache.get('a') is None and cache.get('c') is None
+    assert cache.stats()['evictions'] == 3
+
+
+def test_prediction_cache_persists_entries_for_the_same_model(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = PredictionCache(path=path)
+    cache.bind_model('v1')
+    cache.put('feel tired', [0.2, 0.8])
+    cache.save()
+
+    reloaded = PredictionCache(path=path)
+    reloaded.bind_model('v1')
+    assert reloaded.get('feel tired') == [0.2, 0.8]
+    reloaded.bind_model('v2')
+    assert reloaded.get('feel tired') is None
+    assert reloaded.stats()['invalidations'] == 1
@@ -0,0 +1,84 @@
+import re
+from functools import lru_cache
+
+# Compiled once instead of on every call
+_NON_ALPHA = re.compile(r'[^a-z\s]')
+
+
+def legacy_preprocess_text(text, stop_words, lemmatizer):
+    """The original per-word implementation, kept as the parity reference."""
+    text = text.lower()  # Lowercasing
+    text = re.sub(r'[^a-z\s]', '', text)  # Remove punctuation and numbers
+    words = text.split()  # Tokenization
+    words = [word for word in words if word not in stop_words]  # Remove stop words
+    words = [lemmatizer.lemmatize(word) for word in words]  # Lemmatization
+    return ' '.join(words)
+
+
+class TextPreprocessor:
+    """Normalizes text exactly like ``legacy_preprocess_text``, but faster.
+
+    Each distinct surface form is resolved once (stop word -> dropped,
+    otherwise -> lemma) and kept in a bounded LRU cache, so repeated words
+    cost a single dictionary lookup.
+    """
+
+    def __init__(self, stop_words, lemmatizer, cache_size=200000):
+        self.stop_words = frozenset(stop_words)
+        self.lemmatizer = lemmatizer
+        self._normalize_word = lru_cache(maxsize=cache_size)(self._resolve_word)
+
+    def _resolve_word(self, word):
+        if word in self.stop_words:
+            return None
+        return self.lemmatizer.lemmatize(word)
+
+    def __call__(self, text):
+        words = _NON_ALPHA.sub('', text.lower()).split()
+        return ' '.join([lemma for lemma in map(self._normalize_word, words) if lemma is not None])
+
+    def batch(self, texts):
+        return [self(text) for text in texts]
+
+    def cache_info(self):
+        return self._normalize_word.cache_info()
+
+    def clear_cache(self):
+        self._normalize_word.cache_clear()
+
+
+def check_parity(preprocessor, texts, stop_words, lemmatizer):
+    """Return the (text, expected, actual) triples where the engine differs from the reference."""
+    mismatches = []
+    for text in texts:
+        expected = legacy_preprocess_text(text, stop_words, lemmatizer)
+        actual = preprocessor(text)
+        if expected != actual:
+            mismatches.append((text, expected, actual))
+    return mismatches
+
+
+def main():
+    import argparse
+    import pandas as pd
+    from predictor import get_preprocessor
+
+    parser = argparse.ArgumentParser(description="Check the preprocessing engine against the reference implementation.")
+    parser.add_argument("data", help="CSV file with raw text")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.data, usecols=[args.text_column], nrows=args.limit)[args.text_column]
+    texts = texts.fillna('').astype(str).tolist()
+    preprocessor = get_preprocessor()
+    mismatches = check_parity(preprocessor, texts, preprocessor.stop_words, preprocessor.lemmatizer)
+
+    for text, expected, actual in mismatches[:10]:
+        print(f"MISMATCH: {text!r}\n  expected: {expected!r}\n  actual:   {actual!r}")
+    print(f"{len(texts) - len(mismatches)}/{len(texts)} texts identical; lemma cache: {preprocessor.cache_info()}")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+from predictor import ARTIFACT_FORMAT_VERSION, DEFAULT_ARTIFACT_PATH, save_artifact
+
+
+def load_dataset(data_path):
+    df = pd.read_csv(data_path)
+    df.dropna(subset=['cleaned_text', 'class_name'], inplace=True)
+    return df["cleaned_text"], df["class_name"]
+
+
+def fit_model(texts, labels, max_features, max_iter):
+    # Feature Engineering: TF-IDF Vectorization
+    tfidf_vectorizer = TfidfVectorizer(max_features=max_features)
+    X = tfidf_vectorizer.fit_transform(texts)
+
+    # Train Logistic Regression model
+    model = LogisticRegression(max_iter=max_iter, solver="liblinear")
+    model.fit(X, labels)
+
+    return model, tfidf_vectorizer
+
+
+def train(data_path, max_features=5000, max_iter=1000, test_size=0.2, random_state=42):
+    texts, labels = load_dataset(data_path)
+
+    # Hold out a stratified split to measure accuracy, then refit on everything
+    accuracy = None
+    if test_size:
+        X_train, X_test, y_train, y_test = train_test_split(
+            texts, labels, test_size=test_size, stratify=labels, random_state=random_state
+        )
+        model, vectorizer = fit_model(X_train, y_train, max_features, max_iter)
+        accuracy = accuracy_score(y_test, model.predict(vectorizer.transform(X_test)))
+
+    started = time.perf_counter()
+    model, vectorizer = fit_model(texts, labels, max_features, max_iter)
+    training_seconds = time.perf_counter() - started
+
+    trained_at = datetime.utcnow()
+    metadata = {
+        'model_version': trained_at.strftime('%Y%m%d%H%M%S'),
+        'trained_at': trained_at.isoformat(),
+        'data_path': data_path,
+        'n_samples': len(texts),
+        'classes': [str(c) for c in model.classes_],
+        'vectorizer': 'tfidf',
+        'params': {'max_features': max_features, 'max_iter': max_iter, 'solver': 'liblinear'},
+        'accuracy': accuracy,
+        'test_size': test_size,
+        'training_seconds': round(training_seconds, 3),
+        'sklearn_version': sklearn.__version__,
+    }
+
+    return {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'model': model,
+        'vectorizer': vectorizer,
+        'metadata': metadata,
+    }
+
+
+def iter_training_chunks(data_path, chunksize, holdout_every):
+    """Stream (train_texts, train_labels, test_texts, test_labels) chunks from the CSV.
+
+    Every ``holdout_every``-th row is held out for evaluation, so the split is
+    deterministic across passes without keeping anything in memory.
+    """
+    for chunk in pd.read_csv(data_path, usecols=['cleaned_text', 'class_name'], chunksize=chunksize):
+        chunk = chunk.dropna(subset=['cleaned_text', 'class_name'])
+        # The chunk index continues across chunks, so it is the global row number
+        positions = chunk.index.to_numpy()
+        holdout = (positions % holdout_every == 0) if holdout_every else np.zeros(len(chunk), dtype=bool)
+        texts = chunk['cleaned_text'].astype(str).to_numpy()
+        labels = chunk['class_name'].astype(str).to_numpy()
+        yield texts[~holdout], labels[~holdout], texts[holdout], labels[holdout]
+
+
+def train_streaming(data_path, n_features=2 ** 20, chunksize=50000, epochs=3, use_idf=True,
+                    alpha=1e-5, holdout_every=5, random_state=42):
+    """Out-of-core training: hashing features + SGD logistic regression via partial_fit.
+
+    Peak memory depends on ``chunksize`` and ``n_features`` only, not on the
+    size of the dataset. The first pass collects the classes and, if
+    ``use_idf`` is set, document frequencies for a streaming IDF.
+    """
+    hashing_vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+
+    # Pass 1: classes and document frequencies
+    classes = set()
+    document_frequency = np.zeros(n_features, dtype=np.int64)
+    n_documents = 0
+    for train_texts, train_labels, _, _ in iter_training_chunks(data_path, chunksize, holdout_every):
+        classes.update(train_labels)
+        n_documents += len(train_texts)
+        if use_idf and len(train_texts):
+            counts = hashing_vectorizer.transform(train_texts)
+            document_frequency += np.bincount(counts.indices, minlength=n_features)
+    classes = np.array(sorted(classes))
+
+    # Same smoothed IDF formula as TfidfVectorizer
+    tfidf_transformer = TfidfTransformer(use_idf=use_idf)
+    if use_idf:
+        tfidf_transformer.idf_ = np.log((1 + n_documents) / (1 + document_frequency)) + 1
+    tfidf_transformer.n_features_in_ = n_features
+    vectorizer = make_pipeline(hashing_vectorizer, tfidf_transformer)
+
+    # Pass 2..n: incremental fitting, shuffling inside each chunk
+    model = SGDClassifier(loss='log_loss', alpha=alpha, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    started = time.perf_counter()
+    for _ in range(epochs):
+        for train_texts, train_labels, _, _ in iter_training_chunks(data_path, chunksize, holdout_every):
+            if not len(train_texts):
+                continue
+            order = rng.permutation(len(train_texts))
+            model.partial_fit(vectorizer.transform(train_texts[order]), train_labels[order], classes=classes)
+    training_seconds = time.perf_counter() - started
+
+    # Final pass: accuracy on the held-out rows
+    correct = total = 0
+    for _, _, test_texts, test_labels in iter_training_chunks(data_path, chunksize, holdout_every):
+        if len(test_texts):
+            correct += int((model.predict(vectorizer.transform(test_texts)) == test_labels).sum())
+            total += len(test_texts)
+    accuracy = correct / total if total else None
+
+    trained_at = datetime.utcnow()
+    metadata = {
+        'model_version': trained_at.strftime('%Y%m%d%H%M%S'),
+        'trained_at': trained_at.isoformat(),
+        'data_path': data_path,
+        'n_samples': n_documents,
+        'classes': [str(c) for c in classes],
+        'vectorizer': 'hashing',
+        'params': {'n_features': n_features, 'use_idf': use_idf, 'epochs': epochs,
+                   'alpha': alpha, 'chunksize': chunksize, 'loss': 'log_loss'},
+        'accuracy': accuracy,
+        'test_size': 1 / holdout_every if holdout_every else 0,
+        'training_seconds': round(training_seconds, 3),
+        'sklearn_version': sklearn.__version__,
+    }
+
+    return {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'model': model,
+        'vectorizer': vectorizer,
+        'metadata': metadata,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the mental health predictor and save it as an artifact.")
+    parser.add_argument("--data", default="both_train_cleaned.csv", help="Cleaned training CSV")
+    parser.add_argument("--output", default=DEFAULT_ARTIFACT_PATH, help="Where to write the artifact")
+    parser.add_argument("--max-features", type=int, default=5000)
+    parser.add_argument("--max-iter", type=int, default=1000)
+    parser.add_argument("--test-size", type=float, default=0.2,
+                        help="Held-out fraction used to report accuracy (0 to skip)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Out-of-core mode: hashing features + partial_fit, bounded memory")
+    parser.add_argument("--n-features", type=int, default=2 ** 20, help="Hashing space size (streaming mode)")
+    parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk (streaming mode)")
+    parser.add_argument("--epochs", type=int, default=3, help="Passes over the data (streaming mode)")
+    parser.add_argument("--alpha", type=float, default=1e-5, help="SGD regularization (streaming mode)")
+    parser.add_argument("--no-idf", action="store_true", help="Skip the streaming IDF pass (streaming mode)")
+    args = parser.parse_args()
+
+    if args.streaming:
+        holdout_every = round(1 / args.test_size) if args.test_size else 0
+        artifact = train_streaming(args.data, args.n_features, args.chunksize, args.epochs,
+                                   not args.no_idf, args.alpha, holdout_every)
+    else:
+        artifact = train(args.data, args.max_features, args.max_iter, args.test_size)
+    path = save_artifact(artifact, args.output)
+
+    metadata = artifact['metadata']
+    print(f"Saved model {metadata['model_version']} to {path}")
+    if metadata['accuracy'] is not None:
+        print(f"Held-out accuracy: {metadata['accuracy']:.3f}")
+    print(f"Training time: {metadata['training_seconds']}s on {metadata['n_samples']} samples")
+
+
+if __name__ == "__main__":
+    main()
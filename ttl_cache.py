@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after a TTL.
+
+    At most ``max_entries`` are kept; the least recently used entry is
+    dropped first. ``clock`` defaults to ``time.monotonic``; pass
+    ``time.time`` when expiry times have to survive a restart.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=60, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= self.clock():
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl_seconds=None):
+        """Store ``value``; ``ttl_seconds`` can shorten, but not extend, the cache TTL."""
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, value)
+            self._entries.move_to_end(key)
+            self._evict_overflow()
+
+    def pop(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def items(self):
+        """Live entries as ``(key, expires_at, value)``, least recently used first."""
+        now = self.clock()
+        with self._lock:
+            return [(key, expires_at, value) for key, (expires_at, value) in self._entries.items()
+                    if expires_at > now]
+
+    def replace_items(self, items):
+        """Replace the contents with ``(key, expires_at, value)`` entries, skipping expired ones."""
+        now = self.clock()
+        with self._lock:
+            self._entries = OrderedDict(
+                (key, (expires_at, value)) for key, expires_at, value in items if expires_at > now
+            )
+            self._evict_overflow()
+
+    def _evict_overflow(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
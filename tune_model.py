@@ -0,0 +1,187 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+
+DEFAULT_GRID = {
+    'max_features': [2000, 5000, 10000],
+    'sublinear_tf': [False, True],
+    'C': [0.5, 1.0, 2.0],
+    'max_iter': [1000],
+    'solver': ['liblinear'],
+}
+
+
+def _dataset_fingerprint(data_path):
+    stat = os.stat(data_path)
+    return hashlib.sha1(f"{os.path.abspath(data_path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+
+
+def build_feature_cache(data_path, cache_dir):
+    """Tokenize and count the training set once and store the CSR arrays as .npy files.
+
+    The cache is reused as long as the CSV is unchanged. Workers open the
+    arrays memory-mapped, so the matrix is shared instead of copied per process.
+    """
+    fingerprint = _dataset_fingerprint(data_path)
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('fingerprint') == fingerprint:
+            return meta
+
+    df = pd.read_csv(data_path, usecols=['cleaned_text', 'class_name'])
+    df.dropna(subset=['cleaned_text', 'class_name'], inplace=True)
+
+    # Same tokenization as TfidfVectorizer; max_features is applied per configuration later
+    counts = CountVectorizer().fit_transform(df['cleaned_text']).tocsr()
+    counts.sort_indices()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(os.path.join(cache_dir, 'data.npy'), counts.data)
+    np.save(os.path.join(cache_dir, 'indices.npy'), counts.indices)
+    np.save(os.path.join(cache_dir, 'indptr.npy'), counts.indptr)
+    np.save(os.path.join(cache_dir, 'labels.npy'), df['class_name'].astype(str).to_numpy())
+
+    meta = {'fingerprint': fingerprint, 'data_path': data_path, 'shape': list(counts.shape)}
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+    return meta
+
+
+# Matrix opened once per worker process
+_counts = None
+_labels = None
+
+
+def _open_cache(cache_dir):
+    global _counts, _labels
+    with open(os.path.join(cache_dir, 'meta.json')) as f:
+        shape = tuple(json.load(f)['shape'])
+    arrays = [np.load(os.path.join(cache_dir, f'{name}.npy'), mmap_mode='r') for name in ('data', 'indices', 'indptr')]
+    _counts = sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+    _labels = np.load(os.path.join(cache_dir, 'labels.npy'), allow_pickle=True)
+
+
+def evaluate_fold(config, train_index, test_index):
+    """Fit one configuration on one fold; mirrors TfidfVectorizer(max_features) + LogisticRegression."""
+    X_train, X_test = _counts[train_index], _counts[test_index]
+
+    # Keep the most frequent terms of the training fold, as TfidfVectorizer does
+    term_frequency = np.asarray(X_train.sum(axis=0)).ravel()
+    columns = np.sort(np.argsort(-term_frequency, kind='stable')[:config['max_features']])
+    X_train, X_test = X_train[:, columns], X_test[:, columns]
+
+    started = time.perf_counter()
+    tfidf = TfidfTransformer(sublinear_tf=config['sublinear_tf']).fit(X_train)
+    model = LogisticRegression(C=config['C'], max_iter=config['max_iter'], solver=config['solver'])
+    model.fit(tfidf.transform(X_train), _labels[train_index])
+    fit_seconds = time.perf_counter() - started
+
+    accuracy = float((model.predict(tfidf.transform(X_test)) == _labels[test_index]).mean())
+    # Terms are stored with the vectorizer, so count them roughly as part of the model size
+    model_size = len(pickle.dumps(model)) + len(pickle.dumps(tfidf)) + 16 * len(columns)
+    return accuracy, fit_seconds, model_size
+
+
+def _evaluate(task):
+    config_index, config, train_index, test_index = task
+    try:
+        return config_index, evaluate_fold(config, train_index, test_index), None
+    except Exception as e:
+        return config_index, None, str(e)
+
+
+def expand_grid(grid):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def tune(data_path, cache_dir='.tune_cache', grid=None, folds=5, workers=None, random_state=42):
+    meta = build_feature_cache(data_path, cache_dir)
+    _open_cache(cache_dir)
+
+    configs = expand_grid(grid or DEFAULT_GRID)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=random_state)
+    splits = list(splitter.split(np.zeros(len(_labels)), _labels))
+    tasks = [(i, config, train_index, test_index)
+             for i, config in enumerate(configs) for train_index, test_index in splits]
+
+    results = {i: {'accuracies': [], 'fit_seconds': [], 'model_size_bytes': [], 'errors': []}
+               for i in range(len(configs))}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_cache, initargs=(cache_dir,)) as pool:
+        for config_index, outcome, error in pool.map(_evaluate, tasks):
+            if error:
+                results[config_index]['errors'].append(error)
+                continue
+            accuracy, fit_seconds, model_size = outcome
+            results[config_index]['accuracies'].append(accuracy)
+            results[config_index]['fit_seconds'].append(fit_seconds)
+            results[config_index]['model_size_bytes'].append(model_size)
+
+    rows = []
+    for i, config in enumerate(configs):
+        result = results[i]
+        row = dict(config)
+        if result['accuracies']:
+            row.update({
+                'accuracy_mean': round(float(np.mean(result['accuracies'])), 4),
+                'accuracy_std': round(float(np.std(result['accuracies'])), 4),
+                'fit_seconds_mean': round(float(np.mean(result['fit_seconds'])), 3),
+                'model_size_bytes': int(np.mean(result['model_size_bytes'])),
+            })
+        if result['errors']:
+            row['error'] = result['errors'][0]
+        rows.append(row)
+    rows.sort(key=lambda row: row.get('accuracy_mean', -1), reverse=True)
+
+    return {
+        'data_path': data_path,
+        'n_samples': meta['shape'][0],
+        'n_terms': meta['shape'][1],
+        'folds': folds,
+        'total_seconds': round(time.perf_counter() - started, 2),
+        'results': rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated grid search over vectorizer/classifier settings.")
+    parser.add_argument("--data", default="both_train_cleaned.csv", help="Cleaned training CSV")
+    parser.add_argument("--cache-dir", default=".tune_cache", help="Where the tokenized count matrix is cached")
+    parser.add_argument("--grid", default=None, help="JSON file mapping parameter names to lists of values")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", default="tuning_report.json", help="JSON report; a .csv is written next to it")
+    args = parser.parse_args()
+
+    grid = dict(DEFAULT_GRID)
+    if args.grid:
+        with open(args.grid) as f:
+            grid.update(json.load(f))
+
+    report = tune(args.data, args.cache_dir, grid, args.folds, args.workers)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    pd.DataFrame(report['results']).to_csv(os.path.splitext(args.output)[0] + '.csv', index=False)
+
+    best = report['results'][0]
+    print(f"Evaluated {len(report['results'])} configurations x {args.folds} folds in {report['total_seconds']}s")
+    print(f"Best: {json.dumps(best)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,15 @@
 from flask import Blueprint, jsonify, request
-from src.models.user import User, db
+from src.models.user import Goal, User, db
+from src.routes.auth import invalidate_user
+from src.routes.goals import GoalProgress
+from src.routes.health import HealthDailyRollup, HealthMeasurement, HealthRecordIngestKey
+from src.routes.notifications import MedicationSchedule
+from src.routes.serialization import UserDataVersion
+
+# Per-user tables outside the User relationships. They are deleted explicitly
+# because ON DELETE CASCADE is only enforced on SQLite databases opened with
+# foreign keys on.
+USER_DATA_MODELS = (HealthMeasurement, HealthRecordIngestKey, HealthDailyRollup, MedicationSchedule, UserDataVersion)
 
 user_bp = Blueprint('user', __name__)
 
@@ -29,11 +39,18 @@ def update_user(user_id):
     user.username = data.get('username', user.username)
     user.email = data.get('email', user.email)
     db.session.commit()
+    invalidate_user(user.id)
     return jsonify(user.to_dict())
 
 @user_bp.route('/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
     user = User.query.get_or_404(user_id)
+    GoalProgress.query.filter(
+        GoalProgress.goal_id.in_(db.session.query(Goal.id).filter(Goal.user_id == user_id))
+    ).delete(synchronize_session=False)
+    for model in USER_DATA_MODELS:
+        model.query.filter_by(user_id=user_id).delete(synchronize_session=False)
     db.session.delete(user)
     db.session.commit()
+    invalidate_user(user_id)
     return '', 204